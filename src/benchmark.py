@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Frame-time benchmark over the shipped levels and synthetic stress levels
+
+Runs every scenario headless on the same input route and seed, or on a
+recorded run of that scenario from --recordings, timing each frame and
+each game task until the run ends, and writes p50/p95/p99 figures as JSON.
+
+Usage: python src/benchmark.py --output bench.json [--compare baseline.json]
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from headless import HeadlessJump
+from systems.scripted_input import ScriptedInput
+from systems.input_recorder import InputReplay
+
+# Tasks timed individually, in the order they are reported
+TIMED_TASKS = [
+    "physics_update",
+    "player_update",
+    "enemy_manager_update",
+    "gun_combat_update",
+    "stopwatch_task",
+]
+
+DEFAULT_LEVELS = [1, 2, 3]
+DEFAULT_STRESS = ["200x20", "1000x100"]  # Platforms x enemies
+
+def make_stress_level(platform_count, enemy_count, seed=0):
+    """Build level data with a ground slab, a spiral of platforms and a ring of enemies"""
+    rng = random.Random(seed)
+    platforms = [{
+        "position": [-40, -40, 0],
+        "scale": [80, 80, 0.5],
+        "color": [0.2, 0.5, 0.2, 1],
+        "type": "ground"
+    }]
+    colors = [[0.5, 0.5, 0.5, 1], [0.4, 0.4, 0.6, 1], [0.6, 0.4, 0.4, 1]]
+    for i in range(platform_count):
+        angle = i * 0.45
+        radius = 6 + (i % 24) * 1.3
+        platforms.append({
+            "position": [
+                radius * rng.uniform(0.9, 1.1) * math.cos(angle),
+                radius * rng.uniform(0.9, 1.1) * math.sin(angle),
+                1.5 + i * 0.4
+            ],
+            "scale": [2, 2, 0.5],
+            "color": colors[i % len(colors)],
+            "type": "platform",
+            "id": f"platform_{i}"
+        })
+    
+    enemy_spawns = []
+    for _ in range(enemy_count):
+        angle = rng.uniform(0, 2 * math.pi)
+        radius = rng.uniform(6, 35)
+        enemy_spawns.append({
+            "position": [radius * math.cos(angle), radius * math.sin(angle), 1.5],
+            "type": "basic"
+        })
+    
+    return {
+        "name": f"Stress {platform_count}x{enemy_count}",
+        "spawn_point": [0, 0, 2],
+        "platforms": platforms,
+        "enemy_spawns": enemy_spawns,
+        "level_bounds": {"min": [-60, -60, -10], "max": [60, 60, 20 + platform_count * 0.4]}
+    }
+
+def percentile(sorted_values, q):
+    """Linearly interpolated percentile (q in 0..100) of a sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * q / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+def summarize(samples):
+    """Get millisecond statistics for a list of per-frame times in seconds"""
+    values = sorted(sample * 1000.0 for sample in samples)
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+    return {
+        "p50": round(percentile(values, 50), 4),
+        "p95": round(percentile(values, 95), 4),
+        "p99": round(percentile(values, 99), 4),
+        "mean": round(sum(values) / len(values), 4),
+        "max": round(values[-1], 4),
+    }
+
+def run_scenario(app, name, level, ticks, warmup, seed):
+    """Play one level on the route and return its timing summary"""
+    if not app.load(level, seed=seed):
+        print(f"Skipping {name}: level failed to load")
+        app.unload()
+        return None
+    
+    # Counted before streaming parks any of them
+    enemies = len(app.level.enemy_manager)
+    lives = app.player.lives
+    
+    # Look tasks up once; they live for the whole scenario
+    tasks = {}
+    for task_name in TIMED_TASKS:
+        found = app.taskMgr.getTasksNamed(task_name)
+        if found:
+            tasks[task_name] = found[0]
+    
+    # Stop timing when the run ends so post-game frames don't skew the figures
+    frame_times = []
+    task_times = {task_name: [] for task_name in tasks}
+    for tick in range(warmup + ticks):
+        if app.victory or app.game_over:
+            break
+        start = time.perf_counter()
+        app.step()
+        elapsed = time.perf_counter() - start
+        if tick < warmup:
+            continue
+        frame_times.append(elapsed)
+        for task_name, task in tasks.items():
+            task_times[task_name].append(task.getDt())  # Real time of the task's last run
+    
+    if app.game_over or app.victory:
+        print(f"{name} ended early at tick {app.tick} ({'victory' if app.victory else 'game over'})")
+    
+    result = {
+        "frames": len(frame_times),
+        "enemies": enemies,
+        "lives_lost": lives - app.player.lives,
+        "ended": "victory" if app.victory else "game_over" if app.game_over else None,
+        "frame_ms": summarize(frame_times),
+        "tasks_ms": {task_name: summarize(times) for task_name, times in task_times.items()},
+    }
+    app.unload()
+    return result
+
+def get_commit():
+    """Get the current git commit, if the tree is a git checkout"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline, threshold):
+    """Print p95 changes against a baseline run, returning True on any regression"""
+    regressed = False
+    for name, scenario in results["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not scenario or not old:
+            continue
+        rows = [("frame", scenario["frame_ms"], old["frame_ms"])]
+        rows += [(task_name, stats, old["tasks_ms"].get(task_name))
+                 for task_name, stats in scenario["tasks_ms"].items()]
+        for label, new_stats, old_stats in rows:
+            if not old_stats or old_stats["p95"] <= 0:
+                continue
+            change = (new_stats["p95"] - old_stats["p95"]) / old_stats["p95"]
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressed = True
+            print(f"{name:>18} {label:<22} p95 {old_stats['p95']:8.3f} -> {new_stats['p95']:8.3f} ms ({change:+.1%}){flag}")
+    return regressed
+
+def parse_stress(spec):
+    """Parse an NxM stress spec into (platforms, enemies)"""
+    platforms, enemies = spec.lower().split("x")
+    return int(platforms), int(enemies)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Jump! frame times headless")
+    parser.add_argument("--levels", type=int, nargs="*", default=DEFAULT_LEVELS, help="Shipped levels to run")
+    parser.add_argument("--stress", nargs="*", default=DEFAULT_STRESS, help="Synthetic levels as PLATFORMSxENEMIES")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Simulated seconds timed per scenario")
+    parser.add_argument("--warmup", type=int, default=60, help="Untimed ticks before measuring")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for enemies and stress levels")
+    parser.add_argument("--route", default=None, help="JSON input script or .jrec recording to play")
+    parser.add_argument("--recordings", default=None,
+                        help="Directory of recorded runs; <scenario>.jrec (e.g. level_2.jrec) replaces the route for that scenario")
+    parser.add_argument("--output", default=None, help="Write results JSON here (default: stdout)")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to compare p95 against")
+    parser.add_argument("--profile", action="store_true", help="Also time every task with the task profiler and print its report")
+    parser.add_argument("--threshold", type=float, default=0.10, help="p95 increase counted as a regression")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    if args.route and args.route.endswith(".jrec"):
+        route = InputReplay.load(args.route)
+    elif args.route:
+        route = ScriptedInput.from_file(args.route)
+    else:
+        route = ScriptedInput()
+    
+    app = HeadlessJump(script=route, load_arena=False, with_hud=True, profile=args.profile)
+    ticks = int(args.seconds * app.tick_rate)
+    
+    scenarios = [(f"level_{num}", num) for num in args.levels]
+    for spec in args.stress:
+        platforms, enemies = parse_stress(spec)
+        scenarios.append((f"stress_{platforms}x{enemies}", make_stress_level(platforms, enemies, args.seed)))
+    
+    results = {
+        "meta": {
+            "commit": get_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tick_rate": app.tick_rate,
+            "ticks": ticks,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "route": args.route or "default",
+            "recordings": args.recordings,
+            "profiled": args.profile,
+        },
+        "scenarios": {},
+    }
+    for name, level in scenarios:
+        # A recorded run of this scenario replaces the route, with its own seed
+        app.input, seed, scenario_ticks = route, args.seed, ticks
+        source = args.route or "default"
+        replay_path = os.path.join(args.recordings, f"{name}.jrec") if args.recordings else None
+        if replay_path and os.path.exists(replay_path):
+            app.input = InputReplay.load(replay_path)
+            seed, source = app.input.seed, replay_path
+            scenario_ticks = min(ticks, max(len(app.input) - args.warmup, 0))
+        
+        print(f"Running {name} on {source}...")
+        result = run_scenario(app, name, level, scenario_ticks, args.warmup, seed)
+        if result:
+            result["route"] = source
+        results["scenarios"][name] = result
+    if app.profiler:
+        print(app.profiler.report())
+    app.cleanup()
+    
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"Wrote {args.output}")
+    else:
+        print(output)
+    
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
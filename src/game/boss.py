@@ -34,7 +34,7 @@ class Boss(Enemy):
             frameSize=(-0.5, 0.5, -0.05, 0.05),
             pos=(0, 0, 4),  # Position above boss
             scale=1.0,  # Bigger health bar
-            parent=self.physics_node
+            parent=self.visual_root
         )
         self.health_bar.setBillboardPointEye()
     
@@ -55,19 +55,12 @@ class Boss(Enemy):
             self.is_attacking = True
             self.attack_timer = self.attack_cooldown
             
-            # Boss shoots multiple times in quick succession
-            success = False
-            for _ in range(3):  # Shoot 3 times
-                shot_success = self.combat_system.enemy_shoot(self)
-                success = success or shot_success
-                
-            return success
+            # Boss fires a three-round burst; it lands as one hit (see CombatSystem.fire_shots)
+            return self.combat_system.enemy_burst(self, count=3)
         return False
     
-    def update(self, task):
+    def update_timers(self, dt):
         """Override to add boss-specific behavior"""
-        dt = globalClock.getDt()
-        
         # Update attack timer
         if self.attack_timer > 0:
             self.attack_timer -= dt
@@ -80,4 +73,4 @@ class Boss(Enemy):
             self.move_speed = 6.0  # Move faster when enraged
             self.actor.setColor(1.0, 0, 0, 1)  # Bright red when enraged
         
-        return super().update(task)  # Continue with normal enemy behavior 
\ No newline at end of file
+        super().update_timers(dt)  # Continue with normal enemy behavior 
\ No newline at end of file
@@ -4,11 +4,45 @@ from panda3d.bullet import BulletCapsuleShape
 from panda3d.bullet import BulletTriangleMesh
 from panda3d.bullet import BulletTriangleMeshShape
 from panda3d.bullet import BulletRigidBodyNode
+from panda3d.bullet import BulletBoxShape
 from panda3d.bullet import ZUp
-from panda3d.core import BitMask32, Point3, Vec3
+from panda3d.core import BitMask32, NodePath, Point3, Vec3, TransformState
 from direct.showbase.ShowBaseGlobal import globalClock
 from panda3d.bullet import BulletDebugNode
 
+class InterpolatedBody:
+    """Render-side proxy that smooths a physics node between fixed ticks"""
+    
+    def __init__(self, base, physics_np):
+        self.base = base
+        self.physics_np = physics_np
+        # Visuals are parented here instead of directly to the physics node
+        self.node = physics_np.attachNewNode('interpolated')
+        self.prev_pos = physics_np.getPos(base.render)
+        self.curr_pos = Point3(self.prev_pos)
+    
+    def store_previous(self):
+        """Record the position before a physics tick"""
+        self.prev_pos = self.physics_np.getPos(self.base.render)
+    
+    def store_current(self):
+        """Record the position after a physics tick"""
+        self.curr_pos = self.physics_np.getPos(self.base.render)
+    
+    def snap(self):
+        """Drop any pending interpolation, e.g. after a teleport"""
+        self.store_previous()
+        self.curr_pos = Point3(self.prev_pos)
+        self.node.setPos(0, 0, 0)
+    
+    def interpolate(self, alpha):
+        """Place the visuals between the last two ticks"""
+        # Moves applied outside physics since the last tick are kept as-is,
+        # only the last tick's displacement is blended
+        lag = (self.curr_pos - self.prev_pos) * (1.0 - alpha)
+        self.node.setPos(self.base.render, self.physics_np.getPos(self.base.render) - lag)
+
+
 class CollisionSystem:
     # Collision masks
     MASK_PLAYER = BitMask32.bit(0)
@@ -17,29 +51,67 @@ class CollisionSystem:
     MASK_ENEMY = BitMask32.bit(3)
     MASK_COLLECTIBLE = BitMask32.bit(4)
     MASK_TRIGGER = BitMask32.bit(5)
+    MASK_STATIC = ~MASK_TRIGGER  # Level geometry collides with everything but trigger volumes
     
-    def __init__(self, base):
+    # Debug visualization channels
+    DEBUG_CHANNELS = ('wireframe', 'constraints', 'bounding_boxes', 'normals')
+    
+    def __init__(self, base, tick_rate=60, max_catchup_steps=5):
         self.base = base
         
+        # Fixed timestep settings
+        self.tick_rate = tick_rate
+        self.fixed_dt = 1.0 / tick_rate
+        self.max_catchup_steps = max_catchup_steps  # Max ticks per frame before dropping time
+        self.accumulator = 0.0
+        self.interpolated = []  # InterpolatedBody proxies for players and enemies
+        
         # Create Bullet world
         self.world = BulletWorld()
         self.world.setGravity(Vec3(0, 0, -75.0))
         
-        # Enable debug visualization
-        debugNode = BulletDebugNode('Debug')
-        debugNode.showWireframe(True)
-        debugNode.showConstraints(True)
-        debugNode.showBoundingBoxes(True)
-        debugNode.showNormals(True)
-        
-        debugNP = self.base.render.attachNewNode(debugNode)
-        debugNP.show()
-        
-        self.world.setDebugNode(debugNode)
+        # Debug visualization is off until enabled, so it costs nothing by default
+        self.debug_np = None
+        self.debug_channels = dict.fromkeys(self.DEBUG_CHANNELS, False)
+        self.debug_channels['wireframe'] = True
         
         # Add physics update task
         self.base.taskMgr.add(self.update, "physics_update")
     
+    def is_debug_enabled(self):
+        """Check if the Bullet debug overlay is attached"""
+        return self.debug_np is not None
+    
+    def set_debug_enabled(self, enabled):
+        """Attach or fully detach the Bullet debug overlay"""
+        if enabled and self.debug_np is None:
+            debug_node = BulletDebugNode('Debug')
+            self.debug_np = self.base.render.attachNewNode(debug_node)
+            self.debug_np.show()
+            self.world.setDebugNode(debug_node)
+            self._apply_debug_channels()
+        elif not enabled and self.debug_np is not None:
+            self.world.clearDebugNode()
+            self.debug_np.removeNode()
+            self.debug_np = None
+    
+    def set_debug_channel(self, channel, enabled):
+        """Show or hide one debug channel (wireframe, constraints, bounding_boxes, normals)"""
+        if channel not in self.debug_channels:
+            raise ValueError(f"Unknown debug channel: {channel}")
+        self.debug_channels[channel] = enabled
+        self._apply_debug_channels()
+    
+    def _apply_debug_channels(self):
+        """Push channel flags to the debug node"""
+        if self.debug_np is None:
+            return
+        debug_node = self.debug_np.node()
+        debug_node.showWireframe(self.debug_channels['wireframe'])
+        debug_node.showConstraints(self.debug_channels['constraints'])
+        debug_node.showBoundingBoxes(self.debug_channels['bounding_boxes'])
+        debug_node.showNormals(self.debug_channels['normals'])
+    
     def setup_player(self, player):
         """Set up collision detection for the player"""
         # Create capsule shape for player
@@ -49,7 +121,8 @@ class CollisionSystem:
         player_np.setPos(0, 0, 2)  # Start slightly above ground
         
         # Set specific collision mask for player (can collide with terrain, platforms, enemy bullets)
-        player_np.setCollideMask(self.MASK_PLAYER | self.MASK_TERRAIN | self.MASK_PLATFORM)
+        # and overlaps trigger volumes
+        player_np.setCollideMask(self.MASK_PLAYER | self.MASK_TERRAIN | self.MASK_PLATFORM | self.MASK_TRIGGER)
         
         # Set up character controller properties
         player_node.setGravity(35.0)  # Reduced gravity for better jump control
@@ -75,7 +148,15 @@ class CollisionSystem:
         return enemy_np
     
     def make_collision_from_model(self, model, mass=0):
-        """Create collision mesh from a 3D model"""
+        """Create triangle mesh collision from an arbitrary 3D model"""
+        return self.attach_body(self.build_collision_from_model(model, mass))
+    
+    def build_collision_from_model(self, model, mass=0):
+        """Build triangle mesh collision for a model without adding it to the world
+        
+        Touches neither the scene graph nor the physics world, so it can run
+        on a loading thread; pass the result to attach_body.
+        """
         # Create triangle mesh from model geometry
         mesh = BulletTriangleMesh()
         for np in model.findAllMatches('**/+GeomNode'):
@@ -87,27 +168,91 @@ class CollisionSystem:
         
         # Create rigid body
         body = BulletRigidBodyNode('model_collision')
-        body_np = self.base.render.attachNewNode(body)
+        body_np = NodePath(body)
         body_np.node().addShape(shape)
         body_np.node().setMass(mass)
         body_np.node().setFriction(0.5)
         body_np.setPos(model.getPos())
         body_np.setHpr(model.getHpr())
         body_np.setScale(model.getScale())
-        body_np.setCollideMask(BitMask32.allOn())
+        body_np.setCollideMask(self.MASK_STATIC)
+        return body_np
+    
+    def make_static_boxes(self, boxes, name='static_boxes'):
+        """Create one compound static body from axis-aligned boxes
+        
+        Each box is a (position, scale) pair describing a unit box model
+        (corner at the origin) that was moved and scaled into place.
+        """
+        return self.attach_body(self.build_static_boxes(boxes, name))
+    
+    def build_static_boxes(self, boxes, name='static_boxes'):
+        """Build the compound body for make_static_boxes without adding it to the world"""
+        body = BulletRigidBodyNode(name)
+        for position, scale in boxes:
+            half_extents = Vec3(scale[0], scale[1], scale[2]) * 0.5
+            center = Point3(position[0], position[1], position[2]) + half_extents
+            body.addShape(BulletBoxShape(half_extents), TransformState.makePos(center))
         
+        body.setMass(0)
+        body.setFriction(0.5)
+        body_np = NodePath(body)
+        body_np.setCollideMask(self.MASK_STATIC)
+        return body_np
+    
+    def attach_body(self, body_np):
+        """Add a built static body to the scene and the physics world"""
+        body_np.reparentTo(self.base.render)
         self.world.attachRigidBody(body_np.node())
         return body_np
     
+    def add_interpolation(self, physics_np):
+        """Create an interpolation proxy for a moving physics node"""
+        body = InterpolatedBody(self.base, physics_np)
+        self.interpolated.append(body)
+        return body
+    
+    def remove_interpolation(self, body):
+        """Stop interpolating a physics node"""
+        if body in self.interpolated:
+            self.interpolated.remove(body)
+    
+    def restore_interpolation(self, body):
+        """Resume interpolating a body taken out with remove_interpolation"""
+        if body not in self.interpolated:
+            body.snap()
+            self.interpolated.append(body)
+    
     def update(self, task):
-        """Update physics simulation"""
+        """Step physics at a fixed rate and interpolate visuals between ticks"""
         dt = globalClock.getDt()
-        self.world.doPhysics(dt)
+        self.accumulator += dt
+        
+        steps = 0
+        while self.accumulator >= self.fixed_dt and steps < self.max_catchup_steps:
+            for body in self.interpolated:
+                body.store_previous()
+            self.world.doPhysics(self.fixed_dt, 1, self.fixed_dt)
+            for body in self.interpolated:
+                body.store_current()
+            self.accumulator -= self.fixed_dt
+            steps += 1
+        
+        # After a long hitch, drop the time we could not catch up on
+        # instead of spiralling into ever longer frames
+        if self.accumulator >= self.fixed_dt:
+            self.accumulator %= self.fixed_dt
+        
+        alpha = self.accumulator / self.fixed_dt
+        for body in self.interpolated:
+            body.interpolate(alpha)
         return task.cont
     
     def cleanup(self):
         """Clean up physics world"""
         self.base.taskMgr.remove("physics_update")
+        self.interpolated.clear()
+        self.set_debug_enabled(False)
         # Remove all bodies from the world
         for node in self.base.render.findAllMatches('**/+BulletRigidBodyNode'):
             self.world.removeRigidBody(node.node())
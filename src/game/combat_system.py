@@ -1,14 +1,20 @@
 from direct.showbase.DirectObject import DirectObject
+import math
 from panda3d.core import (
     Point3, Vec3, BitMask32, CollisionNode, CollisionRay, 
-    CollisionHandlerQueue, CollisionTraverser, CardMaker, ColorBlendAttrib, Vec4
+    CollisionHandlerQueue, CollisionTraverser, CardMaker, ColorBlendAttrib
 )
-from direct.interval.IntervalGlobal import Sequence, Wait, Func, LerpPosInterval, LerpScaleInterval, Parallel, LerpColorScaleInterval
 from direct.showbase.ShowBaseGlobal import globalClock
 from panda3d.bullet import BulletRayHit, BulletClosestHitRayResult, BulletAllHitsRayResult
+from game.effect_pool import EffectPool
+from game.line_of_sight import LineOfSightService
+from game.tracer_renderer import TracerRenderer
+from systems.log import get_logger
+
+log = get_logger("combat")
 
 class CombatSystem(DirectObject):
-    def __init__(self, base):
+    def __init__(self, base, tracer_backend="pooled"):
         super().__init__()
         self.base = base
         
@@ -23,8 +29,16 @@ class CombatSystem(DirectObject):
         self.player_shoot_timer = 0
         self.enemy_shoot_timers = {}  # Dictionary to track each enemy's cooldown
         
+        # Spatial enemy index for target lookups (set by the level)
+        self.enemy_manager = None
+        
+        # Cached enemy-to-player visibility, shared with enemy shots
+        self.line_of_sight = LineOfSightService(base)
+        
         # Visual effects
         self.bullet_model = None
+        self.effect_pool = None
+        self.trail_renderer = None  # Effect pool or instanced TracerRenderer
         try:
             # Create a simple sphere for bullets
             from panda3d.core import Point3, Vec3, NodePath
@@ -53,13 +67,32 @@ class CombatSystem(DirectObject):
             glow.setAttrib(ColorBlendAttrib.make(ColorBlendAttrib.MAdd))
             self.glow_model = glow
             self.glow_model.detachNode()
+            
+            # Recycled trail, glow and flash nodes
+            self.effect_pool = EffectPool(self.base, self.bullet_model, self.glow_model)
+            self.trail_renderer = self.effect_pool
+            
+            # Draw all trails in one instanced call when the GPU supports it
+            if tracer_backend == "instanced":
+                if TracerRenderer.is_supported(self.base):
+                    self.trail_renderer = TracerRenderer(self.base)
+                else:
+                    print("Instanced tracers not supported, using pooled trails")
         except Exception as e:
             print("Warning: Could not create bullet model:", str(e))
         
         # Add update task
         self.base.taskMgr.add(self.update, "gun_combat_update")
     
-    def perform_raycast(self, start_pos, direction, is_player):
+    def get_shot_mask(self, is_player):
+        """Get the collision mask for player or enemy bullets"""
+        if is_player:
+            # Player bullets check against enemy and terrain
+            return self.base.collision_system.MASK_ENEMY | self.base.collision_system.MASK_TERRAIN
+        # Enemy bullets check against player and terrain
+        return self.base.collision_system.MASK_PLAYER | self.base.collision_system.MASK_TERRAIN
+    
+    def perform_raycast(self, start_pos, direction, is_player, mask=None):
         """Perform a bullet raycast using Bullet physics"""
         # Get the physics world from the collision system
         world = self.base.collision_system.world
@@ -68,12 +101,8 @@ class CombatSystem(DirectObject):
         end_pos = start_pos + direction * 1000  # Long range
         
         # Set up proper collision masks
-        if is_player:
-            # Player bullets check against enemy and terrain
-            mask = self.base.collision_system.MASK_ENEMY | self.base.collision_system.MASK_TERRAIN
-        else:
-            # Enemy bullets check against player and terrain
-            mask = self.base.collision_system.MASK_PLAYER | self.base.collision_system.MASK_TERRAIN
+        if mask is None:
+            mask = self.get_shot_mask(is_player)
         
         # Perform raycast
         result = world.rayTestClosest(
@@ -84,180 +113,188 @@ class CombatSystem(DirectObject):
         
         return result
     
-    def create_bullet_effect(self, start_pos, end_pos, hit=False, is_player=True):
-        """Create visual bullet effect"""
-        if not self.bullet_model or not self.glow_model:
-            return
-            
-        # Create main bullet trail
-        bullet = self.bullet_model.copyTo(self.base.render)
-        bullet.setPos(start_pos)
+    def make_spread(self, direction, pattern="single", count=1, spread_angle=0.0):
+        """Get shot directions for a spread pattern
         
-        # Create glow trail
-        glow = self.glow_model.copyTo(self.base.render)
-        glow.setPos(start_pos)
+        "single" fires one ray, "burst" fires count rounds along the same
+        line and "shotgun" fans count pellets in a cone of spread_angle
+        degrees. Patterns are deterministic so identical rays dedupe, which
+        makes a burst a single hit (see fire_shots).
+        """
+        direction = Vec3(direction)
+        direction.normalize()
+        if pattern == "single" or count <= 1:
+            return [direction]
+        if pattern == "burst":
+            return [Vec3(direction) for _ in range(count)]
+        if pattern != "shotgun":
+            raise ValueError(f"Unknown spread pattern: {pattern}")
         
-        # Set colors based on who shot (more intense colors)
-        if is_player:
-            bullet.setColor(0.4, 0.6, 1, 1.0)  # Brighter blue with full opacity
-            glow.setColor(0.2, 0.4, 1, 0.6)    # Brighter blue glow
-        else:
-            bullet.setColor(1, 0.4, 0.4, 1.0)  # Brighter red with full opacity
-            glow.setColor(1, 0.2, 0.2, 0.6)    # Brighter red glow
+        # Build a basis around the aim direction
+        up = Vec3(0, 0, 1) if abs(direction.getZ()) < 0.99 else Vec3(0, 1, 0)
+        side = direction.cross(up)
+        side.normalize()
+        up = side.cross(direction)
+        
+        # Centre pellet plus the rest on a golden-angle spiral inside the cone
+        tan_spread = math.tan(math.radians(spread_angle))
+        directions = [direction]
+        for i in range(1, count):
+            radius = tan_spread * math.sqrt(i / (count - 1))
+            angle = i * 2.399963  # Golden angle in radians
+            pellet = direction + side * (radius * math.cos(angle)) + up * (radius * math.sin(angle))
+            pellet.normalize()
+            directions.append(pellet)
+        return directions
+    
+    def resolve_shots(self, shots):
+        """Resolve a batch of shot requests together
         
-        # Create sequence to animate bullet and glow
-        time = 0.3  # Slower bullet travel
-        bullet_move = LerpPosInterval(bullet, time, end_pos, startPos=start_pos)
-        glow_move = LerpPosInterval(glow, time, end_pos, startPos=start_pos)
+        Each shot is an (origin, direction, mask, owner) tuple. Identical
+        rays are cast once. Returns a list of (shot_index, target, hit_pos)
+        tuples, one per shot, where target is the tagged owner that was hit
+        (or None) and hit_pos is None when nothing was hit.
+        """
+        results = []
+        casts = {}  # Ray key -> (target, hit_pos)
+        for index, (origin, direction, mask, owner) in enumerate(shots):
+            key = self.ray_key(origin, direction, mask)
+            cast = casts.get(key)
+            if cast is None:
+                cast = casts[key] = self._cast_shot(origin, direction, mask, owner)
+            results.append((index, cast[0], cast[1]))
+        return results
+    
+    def ray_key(self, origin, direction, mask):
+        """Get a hashable key that is equal for shots along the same ray"""
+        return (
+            round(origin[0], 3), round(origin[1], 3), round(origin[2], 3),
+            round(direction[0], 4), round(direction[1], 4), round(direction[2], 4),
+            mask.getWord()
+        )
+    
+    def _cast_shot(self, origin, direction, mask, owner):
+        """Cast one shot ray, reusing this frame's line-of-sight ray when possible"""
+        fresh_hit = self.line_of_sight.get_fresh_hit(owner, origin, direction)
+        if fresh_hit:
+            hit_pos, hit_node = fresh_hit
+        else:
+            result = self.base.collision_system.world.rayTestClosest(origin, origin + direction * 1000, mask)
+            if not result.hasHit():
+                return None, None
+            hit_pos = result.getHitPos()
+            hit_node = result.getNode()
         
-        def cleanup():
-            if not bullet.isEmpty():
-                bullet.removeNode()
-            if not glow.isEmpty():
-                glow.removeNode()
+        target = None
+        if hit_node and hit_node.hasPythonTag('owner'):
+            target = hit_node.getPythonTag('owner')
+        return target, hit_pos
+    
+    def fire_shots(self, shots, damage, is_player):
+        """Resolve a batch of shots, applying damage and an effect once per unique ray
         
-        # If hit, add impact flash effect
-        if hit:
-            flash = self.bullet_model.copyTo(self.base.render)
-            flash.setPos(end_pos)
-            flash.setScale(0.8)  # Even bigger flash
+        Shots along the same ray land as a single hit: a burst is one
+        raycast dealing one shot's damage and knockback, whatever its round
+        count. Callers wanting a heavier burst scale damage themselves, and
+        only spread patterns (e.g. "shotgun") can hit more than once.
+        Returns the compact result list from resolve_shots.
+        """
+        results = self.resolve_shots(shots)
+        resolved = set()
+        for index, target, hit_pos in results:
+            origin, direction, mask, owner = shots[index]
+            key = self.ray_key(origin, direction, mask)
+            if key in resolved:
+                continue
+            resolved.add(key)
             
-            # Color flash based on who shot (more intense)
-            if is_player:
-                flash.setColor(0.5, 0.7, 1, 1)  # More intense blue
-            else:
-                flash.setColor(1, 0.5, 0.5, 1)  # More intense red
-            
-            def cleanup_flash():
-                if not flash.isEmpty():
-                    flash.removeNode()
+            # Enemy bullets only hurt the player, player bullets hurt anything damageable
+            hit = False
+            if target is not None and target is not owner and hasattr(target, 'take_damage'):
+                if is_player or target == getattr(self.base, 'player', None):
+                    target.take_damage(damage, direction * self.KNOCKBACK_FORCE)
+                    hit = True
             
-            # Create more dramatic flash sequence
-            flash_seq = Sequence(
-                Parallel(
-                    LerpScaleInterval(flash, 0.1, Vec3(1.5, 1.5, 1.5)),  # Bigger expansion
-                    LerpColorScaleInterval(flash, 0.1, Vec4(1, 1, 1, 0), Vec4(1, 1, 1, 1))  # Fade out
-                ),
-                Func(cleanup_flash)
-            )
-            flash_seq.start()
+            end_pos = hit_pos if hit_pos is not None else origin + direction * 500
+            self.create_bullet_effect(origin, end_pos, hit, is_player)
+        return results
+    
+    def enemy_burst(self, enemy, count=3, pattern="burst", spread_angle=0.0):
+        """Fire a multi-shot attack at the player as one batch"""
+        if self.enemy_shoot_timers.get(enemy, 0) > 0 or not hasattr(self.base, 'player'):
+            return False
         
-        # Start bullet and glow sequence with fade out
-        Sequence(
-            Parallel(
-                bullet_move,
-                glow_move,
-                LerpColorScaleInterval(bullet, time * 0.8, Vec4(1, 1, 1, 0), Vec4(1, 1, 1, 1)),  # Fade out bullet later
-                LerpColorScaleInterval(glow, time, Vec4(1, 1, 1, 0), Vec4(1, 1, 1, 1))  # Full time glow fade
-            ),
-            Func(cleanup)
-        ).start()
+        log.debug("Enemy attempting to shoot at player")
+        
+        # Aim from eye level at the player
+        enemy_pos = enemy.physics_node.getPos()
+        start_pos = enemy_pos + Vec3(0, 0, 1)
+        direction = self.base.player.physics_node.getPos() - enemy_pos
+        direction.normalize()
+        
+        mask = self.get_shot_mask(False)
+        shots = [(start_pos, shot_dir, mask, enemy)
+                 for shot_dir in self.make_spread(direction, pattern, count, spread_angle)]
+        self.fire_shots(shots, self.ENEMY_DAMAGE, False)
+        
+        # Start cooldown
+        self.enemy_shoot_timers[enemy] = self.enemy_shoot_cooldown
+        return True
+    
+    def get_targets_in_range(self, pos, radius):
+        """Get enemies within radius of a point"""
+        if not self.enemy_manager:
+            return []
+        return self.enemy_manager.enemies_near(pos, radius)
+    
+    def get_nearest_target(self, pos, max_range=None):
+        """Get the enemy closest to a point, or None"""
+        if not self.enemy_manager:
+            return None
+        nearest = self.enemy_manager.nearest_enemies(pos, 1, max_range)
+        return nearest[0] if nearest else None
+    
+    def create_bullet_effect(self, start_pos, end_pos, hit=False, is_player=True):
+        """Create visual bullet effect with the active trail backend"""
+        if not self.effect_pool:
+            return
+        
+        self.trail_renderer.spawn_trail(start_pos, end_pos, is_player)
+        
+        # If hit, add impact flash effect
+        if hit:
+            self.effect_pool.spawn_flash(end_pos, is_player)
     
     def player_shoot(self, player):
         """Handle player shooting"""
-        if self.player_shoot_timer <= 0:
-            # Get camera direction for bullet trajectory
-            cam_quat = player.get_camera_direction()
-            direction = cam_quat.getForward()
-            
-            # Get start position
-            start_pos = player.physics_node.getPos() + Vec3(0, 0, 0.5)  # Adjust height
-            
-            # Perform raycast
-            result = self.perform_raycast(start_pos, direction, True)
-            
-            # Process hit
-            hit = False
-            hit_pos = None
-            
-            if result.hasHit():
-                hit_pos = result.getHitPos()
-                hit_node = result.getNode()
-                
-                if hit_node and hit_node.hasPythonTag('owner'):
-                    target = hit_node.getPythonTag('owner')
-                    if hasattr(target, 'take_damage'):
-                        # Calculate knockback direction
-                        knockback = direction * self.KNOCKBACK_FORCE
-                        target.take_damage(self.PLAYER_DAMAGE, knockback)
-                        hit = True
-            
-            # Create visual effect
-            if hit_pos:
-                self.create_bullet_effect(start_pos, hit_pos, hit, True)
-            else:
-                # If no hit, send bullet in direction of aim
-                end_pos = start_pos + direction * 500
-                self.create_bullet_effect(start_pos, end_pos, False, True)
-            
-            # Start cooldown
-            self.player_shoot_timer = self.player_shoot_cooldown
-            return True
-        return False
+        if self.player_shoot_timer > 0:
+            return False
+        
+        # Fire along the camera from just above the player's centre
+        direction = player.get_camera_direction().getForward()
+        start_pos = player.physics_node.getPos() + Vec3(0, 0, 0.5)
+        
+        shots = [(start_pos, direction, self.get_shot_mask(True), player)]
+        self.fire_shots(shots, self.PLAYER_DAMAGE, True)
+        
+        # Start cooldown
+        self.player_shoot_timer = self.player_shoot_cooldown
+        return True
     
     def enemy_shoot(self, enemy):
         """Handle enemy shooting"""
-        if enemy not in self.enemy_shoot_timers:
-            self.enemy_shoot_timers[enemy] = 0
-            
-        if self.enemy_shoot_timers[enemy] <= 0:
-            if hasattr(self.base, 'player'):
-                print("Enemy attempting to shoot at player")
-                # Calculate direction to player
-                enemy_pos = enemy.physics_node.getPos()
-                player_pos = self.base.player.physics_node.getPos()
-                direction = (player_pos - enemy_pos)
-                direction.normalize()
-                
-                # Get start position (raised to match eye level)
-                start_pos = enemy_pos + Vec3(0, 0, 1)  # Adjust height
-                
-                # Perform raycast
-                result = self.perform_raycast(start_pos, direction, False)
-                
-                # Process hit
-                hit = False
-                hit_pos = None
-                
-                if result.hasHit():
-                    print("Enemy raycast hit something")
-                    hit_pos = result.getHitPos()
-                    hit_node = result.getNode()
-                    
-                    if hit_node and hit_node.hasPythonTag('owner'):
-                        print("Hit something with owner tag")
-                        target = hit_node.getPythonTag('owner')
-                        if target == self.base.player:  # Specifically check if we hit the player
-                            print("Target is player, applying damage...")
-                            # Calculate knockback
-                            knockback = direction * self.KNOCKBACK_FORCE
-                            target.take_damage(self.ENEMY_DAMAGE, knockback)
-                            hit = True
-                            print("Damage applied successfully")
-                        else:
-                            print(f"Hit something else with owner tag: {target}")
-                    else:
-                        print("Hit something without owner tag or no hit_node")
-                else:
-                    print("Enemy raycast missed")
-                
-                # Create visual effect
-                if hit_pos:
-                    self.create_bullet_effect(start_pos, hit_pos, hit, False)
-                else:
-                    # If no hit, send bullet in direction of aim
-                    end_pos = start_pos + direction * 500
-                    self.create_bullet_effect(start_pos, end_pos, False, False)
-                
-                # Start cooldown
-                self.enemy_shoot_timers[enemy] = self.enemy_shoot_cooldown
-                return True
-        return False
+        return self.enemy_burst(enemy, count=1, pattern="single")
     
     def update(self, task):
         """Update combat system"""
         dt = globalClock.getDt()
         
+        # Advance pooled bullet effects
+        if self.effect_pool:
+            self.effect_pool.update(dt)
+        if self.trail_renderer and self.trail_renderer is not self.effect_pool:
+            self.trail_renderer.update(dt)
+        
         # Update player cooldown
         if self.player_shoot_timer > 0:
             self.player_shoot_timer -= dt
@@ -269,7 +306,24 @@ class CombatSystem(DirectObject):
         
         return task.cont
     
+    def reset(self):
+        """Drop live effects, cooldowns and cached sight lines (used by level restart)"""
+        self.player_shoot_timer = 0
+        self.enemy_shoot_timers.clear()
+        self.line_of_sight.clear()
+        if self.effect_pool:
+            self.effect_pool.clear()
+        if self.trail_renderer and self.trail_renderer is not self.effect_pool:
+            self.trail_renderer.clear()
+    
     def cleanup(self):
         """Clean up combat system"""
         self.base.taskMgr.remove("gun_combat_update")
+        self.line_of_sight.clear()
+        if self.trail_renderer and self.trail_renderer is not self.effect_pool:
+            self.trail_renderer.cleanup()
+        self.trail_renderer = None
+        if self.effect_pool:
+            self.effect_pool.cleanup()
+            self.effect_pool = None
         self.ignoreAll() 
\ No newline at end of file
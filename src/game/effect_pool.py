@@ -0,0 +1,163 @@
+from panda3d.core import Point3
+
+# Colours for player (blue) and enemy (red) shots
+TRAIL_COLORS = {
+    True: ((0.4, 0.6, 1, 1.0), (0.2, 0.4, 1, 0.6)),  # Bullet, glow
+    False: ((1, 0.4, 0.4, 1.0), (1, 0.2, 0.2, 0.6)),
+}
+FLASH_COLORS = {
+    True: (0.5, 0.7, 1, 1),
+    False: (1, 0.5, 0.5, 1),
+}
+
+class EffectPool:
+    """Fixed-capacity pool of bullet trail, glow and impact flash nodes
+    
+    Nodes are created once and recycled; live effects are advanced from
+    plain per-slot arrays by update(), so no intervals are built per shot.
+    When the pool is full the oldest effect is reused.
+    """
+    TRAIL_TIME = 0.3  # Seconds for a trail to reach its end point
+    BULLET_FADE_TIME = TRAIL_TIME * 0.8  # Bullet fades out a bit before the glow
+    FLASH_TIME = 0.1
+    FLASH_START_SCALE = 0.8
+    FLASH_END_SCALE = 1.5
+    
+    def __init__(self, base, bullet_model, glow_model, trail_capacity=64, flash_capacity=32):
+        self.base = base
+        self.root = self.base.render.attachNewNode("effect_pool")
+        
+        # Trail slots: a bullet card and a glow card each
+        self.trail_capacity = trail_capacity
+        self.bullets = []
+        self.glows = []
+        for _ in range(trail_capacity):
+            bullet = bullet_model.copyTo(self.root)
+            glow = glow_model.copyTo(self.root)
+            bullet.hide()
+            glow.hide()
+            self.bullets.append(bullet)
+            self.glows.append(glow)
+        self.trail_age = [0.0] * trail_capacity
+        self.trail_start = [Point3(0, 0, 0) for _ in range(trail_capacity)]
+        self.trail_end = [Point3(0, 0, 0) for _ in range(trail_capacity)]
+        self.trail_live = [False] * trail_capacity
+        self.active_trails = []
+        self.next_trail = 0  # Ring cursor, always points at the oldest slot
+        
+        # Flash slots
+        self.flash_capacity = flash_capacity
+        self.flashes = []
+        for _ in range(flash_capacity):
+            flash = bullet_model.copyTo(self.root)
+            flash.hide()
+            self.flashes.append(flash)
+        self.flash_age = [0.0] * flash_capacity
+        self.flash_live = [False] * flash_capacity
+        self.active_flashes = []
+        self.next_flash = 0
+    
+    def spawn_trail(self, start_pos, end_pos, is_player=True):
+        """Start a bullet trail travelling from start_pos to end_pos"""
+        slot = self.next_trail
+        self.next_trail = (slot + 1) % self.trail_capacity
+        
+        self.trail_age[slot] = 0.0
+        self.trail_start[slot] = Point3(start_pos)
+        self.trail_end[slot] = Point3(end_pos)
+        
+        bullet_color, glow_color = TRAIL_COLORS[is_player]
+        bullet = self.bullets[slot]
+        glow = self.glows[slot]
+        bullet.setColor(*bullet_color)
+        glow.setColor(*glow_color)
+        bullet.setColorScale(1, 1, 1, 1)
+        glow.setColorScale(1, 1, 1, 1)
+        bullet.setPos(start_pos)
+        glow.setPos(start_pos)
+        bullet.show()
+        glow.show()
+        
+        if not self.trail_live[slot]:
+            self.trail_live[slot] = True
+            self.active_trails.append(slot)
+    
+    def spawn_flash(self, pos, is_player=True):
+        """Start an impact flash at pos"""
+        slot = self.next_flash
+        self.next_flash = (slot + 1) % self.flash_capacity
+        
+        self.flash_age[slot] = 0.0
+        flash = self.flashes[slot]
+        flash.setColor(*FLASH_COLORS[is_player])
+        flash.setColorScale(1, 1, 1, 1)
+        flash.setScale(self.FLASH_START_SCALE)
+        flash.setPos(pos)
+        flash.show()
+        
+        if not self.flash_live[slot]:
+            self.flash_live[slot] = True
+            self.active_flashes.append(slot)
+    
+    def update(self, dt):
+        """Advance every live effect"""
+        if self.active_trails:
+            self.active_trails = [slot for slot in self.active_trails if self._update_trail(slot, dt)]
+        if self.active_flashes:
+            self.active_flashes = [slot for slot in self.active_flashes if self._update_flash(slot, dt)]
+    
+    def _update_trail(self, slot, dt):
+        """Move and fade one trail, returning False once it has finished"""
+        age = self.trail_age[slot] + dt
+        self.trail_age[slot] = age
+        if age >= self.TRAIL_TIME:
+            self.bullets[slot].hide()
+            self.glows[slot].hide()
+            self.trail_live[slot] = False
+            return False
+        
+        start = self.trail_start[slot]
+        pos = start + (self.trail_end[slot] - start) * (age / self.TRAIL_TIME)
+        bullet = self.bullets[slot]
+        glow = self.glows[slot]
+        bullet.setPos(pos)
+        glow.setPos(pos)
+        bullet.setAlphaScale(max(0.0, 1.0 - age / self.BULLET_FADE_TIME))
+        glow.setAlphaScale(1.0 - age / self.TRAIL_TIME)
+        return True
+    
+    def _update_flash(self, slot, dt):
+        """Grow and fade one flash, returning False once it has finished"""
+        age = self.flash_age[slot] + dt
+        self.flash_age[slot] = age
+        flash = self.flashes[slot]
+        if age >= self.FLASH_TIME:
+            flash.hide()
+            self.flash_live[slot] = False
+            return False
+        
+        t = age / self.FLASH_TIME
+        flash.setScale(self.FLASH_START_SCALE + (self.FLASH_END_SCALE - self.FLASH_START_SCALE) * t)
+        flash.setAlphaScale(1.0 - t)
+        return True
+    
+    def clear(self):
+        """Hide every live effect"""
+        for slot in self.active_trails:
+            self.bullets[slot].hide()
+            self.glows[slot].hide()
+            self.trail_live[slot] = False
+        for slot in self.active_flashes:
+            self.flashes[slot].hide()
+            self.flash_live[slot] = False
+        self.active_trails = []
+        self.active_flashes = []
+    
+    def cleanup(self):
+        """Remove all pooled nodes"""
+        self.root.removeNode()
+        self.bullets.clear()
+        self.glows.clear()
+        self.flashes.clear()
+        self.active_trails = []
+        self.active_flashes = []
@@ -1,5 +1,4 @@
 from direct.showbase.DirectObject import DirectObject
-from direct.showbase.ShowBaseGlobal import globalClock
 from direct.showbase.MessengerGlobal import messenger
 from panda3d.core import (
     Point3, Vec3, NodePath, CollisionNode, CollisionRay, BitMask32,
@@ -9,6 +8,9 @@ from direct.fsm.FSM import FSM
 from direct.gui.DirectGui import DirectWaitBar
 import math
 import random
+from systems.log import get_logger
+
+log = get_logger("enemy")
 
 class Enemy(FSM, DirectObject):
     def __init__(self, base, collision_system, combat_system, position):
@@ -26,9 +28,12 @@ class Enemy(FSM, DirectObject):
         # Set python tag for combat system
         self.physics_node.setPythonTag('owner', self)
         
+        # Visuals follow an interpolated proxy between physics ticks
+        self.interpolation = self.collision_system.add_interpolation(self.physics_node)
+        self.visual_root = self.interpolation.node
+        
         # Create visual representation (temporary cube)
-        self.actor = self.base.loader.loadModel("models/box")
-        self.actor.reparentTo(self.physics_node)
+        self.actor = self.base.asset_cache.instance("models/box", self.visual_root, "enemy_body")
         self.actor.setScale(1, 1, 2)  # Make it a tall box for now
         self.actor.setPos(-0.5, -0.5, -1)  # Center it on the physics capsule
         self.actor.setColor(0.8, 0.2, 0.2, 1)  # Red color
@@ -52,6 +57,7 @@ class Enemy(FSM, DirectObject):
         self.min_distance = 5.0  # Reduced from 10.0 to allow closer approach
         self.strafe_time = 0  # Timer for strafing movement
         self.strafe_direction = Vec3(0, 0, 0)  # Current strafe direction
+        self.rng = random  # Replaced by EnemyManager's seeded generator
         
         # Create health bar
         self.health_bar = DirectWaitBar(
@@ -62,12 +68,15 @@ class Enemy(FSM, DirectObject):
             frameSize=(-0.5, 0.5, -0.05, 0.05),
             pos=(0, 0, 2),  # Position above enemy
             scale=0.5,
-            parent=self.physics_node
+            parent=self.visual_root
         )
         self.health_bar.setBillboardPointEye()  # Make health bar always face camera
         
-        # Add update task
-        self.base.taskMgr.add(self.update, "enemy_update")
+        # Set by EnemyManager.add, which drives update() every frame
+        self.manager = None
+        self.manager_index = None
+        self.timers_clock = 0.0  # Manager clock when update_timers last ran
+        self.is_parked = False  # Out of the world while its height band is streamed out
         
         # Start with idle state
         self.request('Idle')
@@ -93,6 +102,8 @@ class Enemy(FSM, DirectObject):
             current_pos = self.physics_node.getPos()
             new_pos = current_pos + knockback
             self.physics_node.setPos(new_pos)
+            if self.manager:
+                self.manager.on_enemy_moved(self)
         
         if self.health <= 0:
             self.die()
@@ -109,15 +120,15 @@ class Enemy(FSM, DirectObject):
     def perform_attack(self):
         """Perform shooting attack"""
         if not self.is_attacking and self.attack_timer <= 0:
-            print("Enemy attempting to shoot")
+            log.debug("Enemy attempting to shoot")
             self.is_attacking = True
             self.attack_timer = self.attack_cooldown
             # Use gun combat system to shoot
             success = self.combat_system.enemy_shoot(self)
-            print(f"Enemy shoot result: {success}")
+            log.debug("Enemy shoot result: %s", success)
             return success
         else:
-            print(f"Can't shoot - is_attacking: {self.is_attacking}, timer: {self.attack_timer:.1f}")
+            log.debug("Can't shoot - is_attacking: %s, timer: %.1f", self.is_attacking, self.attack_timer)
         return False
     
     def get_distance_to_player(self):
@@ -140,10 +151,14 @@ class Enemy(FSM, DirectObject):
         direction.normalize()
         return direction
     
-    def update(self, task):
+    def update(self, dt):
         """Update enemy state"""
-        dt = globalClock.getDt()
-        
+        self.update_timers(dt)
+        distance = self.steer(dt)
+        self.update_attack(distance)
+    
+    def update_timers(self, dt):
+        """Update attack and path timers"""
         # Update attack timer
         if self.attack_timer > 0:
             self.attack_timer -= dt
@@ -155,13 +170,15 @@ class Enemy(FSM, DirectObject):
         if self.path_update_timer <= 0:
             self.path_update_timer = self.path_update_interval
             self.update_path()
-        
+    
+    def steer(self, dt):
+        """Move and turn relative to the player, returning the distance to them"""
         # Update strafe timer
         self.strafe_time -= dt
         if self.strafe_time <= 0:
             # Change strafe direction randomly
-            self.strafe_time = random.uniform(1.0, 2.0)
-            angle = random.uniform(0, 2 * math.pi)
+            self.strafe_time = self.rng.uniform(1.0, 2.0)
+            angle = self.rng.uniform(0, 2 * math.pi)
             self.strafe_direction = Vec3(math.cos(angle), math.sin(angle), 0)
         
         # Check distance to player and move accordingly
@@ -194,18 +211,20 @@ class Enemy(FSM, DirectObject):
                 # Update rotation to face player
                 heading = math.degrees(math.atan2(-direction.getX(), direction.getY()))
                 self.physics_node.setH(heading)
-            
-            # Attack if in range and facing player
-            if distance < self.attack_range:
-                print(f"Enemy in attack range (distance: {distance:.1f})")
-                # Check if we have line of sight
-                has_los = self.has_line_of_sight()
-                print(f"Has line of sight: {has_los}")
-                if has_los:
-                    attack_success = self.perform_attack()
-                    print(f"Attack performed: {attack_success}, Timer: {self.attack_timer:.1f}")
         
-        return task.cont
+        return distance
+    
+    def update_attack(self, distance):
+        """Shoot at the player when in range and visible"""
+        # Attack if in range and facing player
+        if distance < self.detection_range and distance < self.attack_range:
+            log.debug("Enemy in attack range (distance: %.1f)", distance)
+            # Check if we have line of sight
+            has_los = self.has_line_of_sight()
+            log.debug("Has line of sight: %s", has_los)
+            if has_los:
+                attack_success = self.perform_attack()
+                log.debug("Attack performed: %s, Timer: %.1f", attack_success, self.attack_timer)
     
     def update_path(self):
         """Update path to target"""
@@ -230,44 +249,8 @@ class Enemy(FSM, DirectObject):
                 self.physics_node.setH(heading)
     
     def has_line_of_sight(self):
-        """Check if enemy has line of sight to player"""
-        if not hasattr(self.base, 'player'):
-            return False
-        
-        # Get direction to player
-        direction = self.get_direction_to_player()
-        start_pos = self.physics_node.getPos() + Vec3(0, 0, 1)  # Raise start position to eye level
-        end_pos = self.base.player.physics_node.getPos() + Vec3(0, 0, 1)  # Aim at player's eye level
-        
-        # Perform raycast using bullet physics - check against both terrain and player
-        result = self.base.collision_system.world.rayTestClosest(
-            start_pos,
-            end_pos,
-            self.base.collision_system.MASK_TERRAIN | self.base.collision_system.MASK_PLAYER
-        )
-        
-        if result.hasHit():
-            hit_node = result.getNode()
-            # If we hit the player, that's a valid line of sight
-            if hit_node and hit_node.hasPythonTag('owner'):
-                target = hit_node.getPythonTag('owner')
-                if target == self.base.player:
-                    print("LOS check - Direct hit on player")
-                    return True
-            
-            # If we hit something else, check if it's closer than the player
-            hit_dist = (result.getHitPos() - start_pos).length()
-            player_dist = (end_pos - start_pos).length()
-            
-            # Debug print
-            print(f"LOS check - Hit dist: {hit_dist:.1f}, Player dist: {player_dist:.1f}")
-            
-            # Return true if the player is closer than the obstacle
-            return hit_dist >= player_dist
-        
-        # If no obstacles hit, we have line of sight
-        print("LOS check - No obstacles hit")
-        return True
+        """Check if enemy has line of sight to player (cached and throttled)"""
+        return self.combat_system.line_of_sight.check(self)
     
     # FSM States
     def enterIdle(self):
@@ -292,12 +275,44 @@ class Enemy(FSM, DirectObject):
     def exitAttack(self):
         pass
     
+    def park(self):
+        """Take the enemy out of the physics world, the scene and its manager"""
+        if self.is_parked:
+            return
+        self.is_parked = True
+        if self.manager:
+            self.manager.remove(self)
+        self.collision_system.world.removeCharacter(self.physics_node.node())
+        self.collision_system.remove_interpolation(self.interpolation)
+        self.visual_root.stash()
+    
+    def unpark(self, manager):
+        """Put a parked enemy back into the world under manager"""
+        if not self.is_parked:
+            return
+        self.is_parked = False
+        
+        # Time spent parked isn't tracked, so come back ready to attack
+        self.attack_timer = 0
+        self.is_attacking = False
+        self.combat_system.enemy_shoot_timers.pop(self, None)
+        
+        self.collision_system.world.attachCharacter(self.physics_node.node())
+        self.collision_system.restore_interpolation(self.interpolation)
+        self.visual_root.unstash()
+        manager.add(self)
+    
     def cleanup(self):
         """Clean up resources"""
-        self.base.taskMgr.remove("enemy_update")
+        if self.manager:
+            self.manager.remove(self)
+        self.combat_system.line_of_sight.forget(self)
+        self.collision_system.remove_interpolation(self.interpolation)
         if self.health_bar:
             self.health_bar.destroy()
         if self.actor:
-            self.actor.removeNode()
+            self.base.asset_cache.release(self.actor)
         if self.physics_node:
+            if not self.is_parked:
+                self.collision_system.world.removeCharacter(self.physics_node.node())
             self.physics_node.removeNode() 
\ No newline at end of file
@@ -0,0 +1,171 @@
+import random
+
+from direct.showbase.ShowBaseGlobal import globalClock
+from game.enemy_steering import EnemySteering, np
+from game.spatial_hash import SpatialHash
+
+class EnemyManager:
+    """Updates every live enemy from one task instead of one task per enemy"""
+    
+    def __init__(self, base, vectorized=True, cell_size=10.0, seed=None):
+        self.base = base
+        self.enemies = []  # Compact list of live enemies
+        
+        # Seeded per run so enemy strafing can be replayed exactly
+        self.seed = seed
+        self.rng = random.Random(seed)
+        
+        # Batched NumPy steering when available, per-enemy steering otherwise
+        self.steering = None
+        if vectorized and EnemySteering.is_available():
+            self.steering = EnemySteering(rng=np.random.default_rng(seed))
+        
+        # Spatial index of enemy positions for range and nearest queries
+        self.spatial_index = SpatialHash(cell_size)
+        self.active_radius = 0.0  # Largest detection range of any enemy
+        self.sync_per_frame = 32  # Far enemies re-synced with physics per frame
+        self.sync_cursor = 0
+        self.clock = 0.0  # Time advanced by update, for catching up inactive enemies' timers
+        
+        # Add update task
+        self.base.taskMgr.add(self.update, "enemy_manager_update")
+    
+    def add(self, enemy):
+        """Start updating an enemy"""
+        enemy.manager = self
+        enemy.manager_index = len(self.enemies)
+        enemy.rng = self.rng
+        enemy.timers_clock = self.clock
+        self.enemies.append(enemy)
+        if self.steering:
+            self.steering.add(enemy)
+        self.active_radius = max(self.active_radius, enemy.detection_range)
+        self.spatial_index.insert(enemy, enemy.physics_node.getPos())
+    
+    def remove(self, enemy):
+        """Stop updating an enemy (O(1) swap-remove)"""
+        index = enemy.manager_index
+        if index is None:
+            return
+        
+        # Move the last enemy into the freed slot
+        if self.steering:
+            self.steering.remove(index)
+        last = self.enemies.pop()
+        if last is not enemy:
+            self.enemies[index] = last
+            last.manager_index = index
+        
+        self.spatial_index.remove(enemy)
+        enemy.manager = None
+        enemy.manager_index = None
+    
+    def on_enemy_moved(self, enemy):
+        """Refresh an enemy's indexed position after a move outside AI (e.g. knockback)"""
+        self.spatial_index.update(enemy, enemy.physics_node.getPos())
+    
+    def __len__(self):
+        return len(self.enemies)
+    
+    def __iter__(self):
+        return iter(list(self.enemies))
+    
+    def enemies_near(self, pos, radius):
+        """Get live enemies within radius of a point"""
+        return [enemy for enemy, _ in self.spatial_index.query_radius(pos, radius)]
+    
+    def nearest_enemies(self, pos, count=1, max_radius=None):
+        """Get up to count live enemies closest to a point"""
+        return [enemy for enemy, _ in self.spatial_index.nearest(pos, count, max_radius)]
+    
+    def get_active_enemies(self):
+        """Get enemies close enough to the player to run full AI"""
+        if not hasattr(self.base, 'player'):
+            return []
+        player_pos = self.base.player.physics_node.getPos()
+        return self.enemies_near(player_pos, self.active_radius)
+    
+    def sync_far_enemies(self):
+        """Re-read a slice of enemy positions so physics moves (falling) stay indexed"""
+        count = len(self.enemies)
+        if count == 0:
+            return
+        for _ in range(min(self.sync_per_frame, count)):
+            self.sync_cursor = (self.sync_cursor + 1) % count
+            self.on_enemy_moved(self.enemies[self.sync_cursor])
+    
+    def update(self, task):
+        """Update enemies in the player's neighbourhood"""
+        dt = globalClock.getDt()
+        self.clock += dt
+        self.sync_far_enemies()
+        
+        active = self.get_active_enemies()
+        if not active:
+            return task.cont
+        self.catch_up_timers(active, dt)
+        
+        if self.steering:
+            self.update_vectorized(dt, active)
+            return task.cont
+        
+        # Update in reverse index order so an enemy dying mid-loop only
+        # swaps in an enemy that has already been updated this frame
+        active.sort(key=lambda enemy: enemy.manager_index, reverse=True)
+        for enemy in active:
+            if enemy.manager is self:
+                enemy.update(dt)
+                if enemy.manager is self:
+                    self.on_enemy_moved(enemy)
+        
+        return task.cont
+    
+    def catch_up_timers(self, active, dt):
+        """Run the timers of enemies back in range for the time they spent inactive"""
+        for enemy in active:
+            missed = self.clock - dt - enemy.timers_clock
+            if missed > 1e-6:
+                enemy.update_timers(missed)
+            enemy.timers_clock = self.clock
+    
+    def update_vectorized(self, dt, active):
+        """Update active enemies with one NumPy steering pass"""
+        enemies = self.enemies
+        for enemy in active:
+            enemy.update_timers(dt)
+        
+        player_pos = None
+        if hasattr(self.base, 'player'):
+            player_pos = self.base.player.physics_node.getPos()
+        
+        # Steer the active horde at once and write results back in bulk
+        rows = np.array(sorted(enemy.manager_index for enemy in active), dtype=np.intp)
+        self.steering.gather(enemies, rows)
+        distances, moved, headings = self.steering.step(dt, player_pos, rows)
+        for enemy in self.steering.scatter(enemies, moved, headings):
+            self.on_enemy_moved(enemy)
+        
+        # Only enemies within attack range need per-enemy attack logic
+        in_range = distances < self.steering.attack_range[rows]
+        targets = [(enemies[i], distance) for i, distance in zip(rows[in_range].tolist(), distances[in_range].tolist())]
+        for enemy, distance in reversed(targets):
+            if enemy.manager is self:
+                enemy.update_attack(distance)
+    
+    def clear(self):
+        """Clean up every enemy and rewind the RNG, but keep updating"""
+        while self.enemies:
+            self.enemies[-1].cleanup()
+        self.spatial_index.clear()
+        self.active_radius = 0.0
+        self.sync_cursor = 0
+        self.rng.seed(self.seed)
+        if self.steering:
+            self.steering.rng = np.random.default_rng(self.seed)
+    
+    def cleanup(self):
+        """Clean up every enemy and stop the update task"""
+        self.base.taskMgr.remove("enemy_manager_update")
+        while self.enemies:
+            self.enemies[-1].cleanup()
+        self.spatial_index.clear()
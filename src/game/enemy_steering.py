@@ -0,0 +1,172 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, enemies fall back to per-enemy steering
+    np = None
+
+class EnemySteering:
+    """Struct-of-arrays steering state for the whole enemy horde
+    
+    Rows mirror EnemyManager's compact enemy list: row i always belongs to
+    the enemy at manager index i, and removal uses the same swap-remove.
+    """
+    STRAFE_SPEED_FACTOR = 0.8  # Strafing is slightly slower than approaching
+    
+    def __init__(self, capacity=64, rng=None):
+        self.count = 0
+        self.capacity = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
+        
+        # Per-enemy state
+        self.positions = None
+        self.velocities = None
+        self.strafe = None
+        self.strafe_time = None
+        
+        # Per-enemy parameters
+        self.move_speed = None
+        self.min_distance = None
+        self.attack_range = None
+        self.detection_range = None
+        
+        self._grow(capacity)
+    
+    @staticmethod
+    def is_available():
+        """Check whether NumPy is installed"""
+        return np is not None
+    
+    def _grow(self, capacity):
+        """Resize every array to hold at least capacity enemies"""
+        def resized(array, shape, fill=0.0):
+            new = np.full(shape, fill, dtype=np.float64)
+            if array is not None:
+                new[:self.count] = array[:self.count]
+            return new
+        
+        self.positions = resized(self.positions, (capacity, 3))
+        self.velocities = resized(self.velocities, (capacity, 3))
+        self.strafe = resized(self.strafe, (capacity, 3))
+        self.strafe_time = resized(self.strafe_time, capacity)
+        self.move_speed = resized(self.move_speed, capacity)
+        self.min_distance = resized(self.min_distance, capacity)
+        self.attack_range = resized(self.attack_range, capacity)
+        self.detection_range = resized(self.detection_range, capacity)
+        self.capacity = capacity
+    
+    def add(self, enemy):
+        """Append a row for an enemy and return its index"""
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+        
+        i = self.count
+        pos = enemy.physics_node.getPos()
+        self.positions[i] = (pos.getX(), pos.getY(), pos.getZ())
+        self.velocities[i] = 0
+        self.strafe[i] = 0
+        self.strafe_time[i] = 0
+        self.move_speed[i] = enemy.move_speed
+        self.min_distance[i] = enemy.min_distance
+        self.attack_range[i] = enemy.attack_range
+        self.detection_range[i] = enemy.detection_range
+        self.count += 1
+        return i
+    
+    def remove(self, index):
+        """Swap-remove a row, matching EnemyManager.remove"""
+        last = self.count - 1
+        if index != last:
+            for array in (self.positions, self.velocities, self.strafe, self.strafe_time,
+                          self.move_speed, self.min_distance, self.attack_range,
+                          self.detection_range):
+                array[index] = array[last]
+        self.count = last
+    
+    def gather(self, enemies, rows):
+        """Read positions and speeds back from the given enemies' NodePaths"""
+        positions = self.positions
+        move_speed = self.move_speed
+        for i in rows.tolist():
+            enemy = enemies[i]
+            pos = enemy.physics_node.getPos()
+            positions[i, 0] = pos.getX()
+            positions[i, 1] = pos.getY()
+            positions[i, 2] = pos.getZ()
+            move_speed[i] = enemy.move_speed  # Changes when the boss enrages
+    
+    def step(self, dt, player_pos, rows):
+        """Compute approach, retreat, strafe and facing for the given rows at once
+        
+        Returns (distances, moved_rows, headings), where distances lines up
+        with rows. Positions of moved enemies are updated in place.
+        """
+        n = len(rows)
+        pos = self.positions[rows]
+        
+        # Update strafe timers and pick new random strafe directions
+        strafe_time = self.strafe_time[rows] - dt
+        strafe = self.strafe[rows]
+        reroll = strafe_time <= 0
+        rerolled = int(reroll.sum())
+        if rerolled:
+            strafe_time[reroll] = self.rng.uniform(1.0, 2.0, rerolled)
+            angles = self.rng.uniform(0, 2 * math.pi, rerolled)
+            strafe[reroll] = np.column_stack((np.cos(angles), np.sin(angles), np.zeros(rerolled)))
+            self.strafe[rows] = strafe
+        self.strafe_time[rows] = strafe_time
+        
+        if player_pos is None or n == 0:
+            self.velocities[rows] = 0
+            return np.full(n, np.inf), np.empty(0, dtype=np.intp), np.empty(0)
+        
+        # Distance and direction to player
+        delta = np.array((player_pos.getX(), player_pos.getY(), player_pos.getZ())) - pos
+        distances = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+        safe = np.where(distances > 0, distances, 1.0)
+        direction = delta / safe[:, None]
+        
+        active = distances < self.detection_range[rows]
+        speed = self.move_speed[rows]
+        
+        # Move away if too close, closer if too far
+        too_close = active & (distances < self.min_distance[rows])
+        too_far = active & ~too_close & (distances > self.attack_range[rows])
+        approach = too_far.astype(np.float64) - too_close.astype(np.float64)
+        movement = direction * (approach * speed)[:, None]
+        
+        # Project strafe direction onto plane perpendicular to direction to player
+        has_strafe = np.einsum('ij,ij->i', strafe, strafe) > 0
+        projected = strafe - direction * np.einsum('ij,ij->i', direction, strafe)[:, None]
+        projected_len = np.sqrt(np.einsum('ij,ij->i', projected, projected))
+        projected /= np.where(projected_len > 0, projected_len, 1.0)[:, None]
+        strafing = active & has_strafe
+        movement[strafing] += projected[strafing] * (speed[strafing] * self.STRAFE_SPEED_FACTOR)[:, None]
+        
+        # Apply normalised movement
+        movement_len = np.sqrt(np.einsum('ij,ij->i', movement, movement))
+        moving = active & (movement_len > 0)
+        velocities = np.zeros((n, 3))
+        velocities[moving] = movement[moving] / movement_len[moving][:, None]
+        pos[moving] += velocities[moving] * dt
+        self.velocities[rows] = velocities
+        self.positions[rows] = pos
+        
+        # Face the player
+        headings = np.degrees(np.arctan2(-direction[moving, 0], direction[moving, 1]))
+        return distances, rows[moving], headings
+    
+    def scatter(self, enemies, moved, headings):
+        """Write new positions and headings back to the moved enemies' NodePaths
+        
+        Returns the moved enemies so callers can refresh their own indexes.
+        """
+        positions = self.positions
+        moved_enemies = []
+        for i, heading in zip(moved.tolist(), headings.tolist()):
+            x, y, z = positions[i].tolist()
+            node = enemies[i].physics_node
+            node.setPos(x, y, z)
+            node.setH(heading)
+            moved_enemies.append(enemies[i])
+        return moved_enemies
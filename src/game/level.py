@@ -1,118 +1,55 @@
+from direct.showbase.DirectObject import DirectObject
+from direct.showbase.MessengerGlobal import messenger
 from panda3d.core import Point3, Vec3
 from game.enemy import Enemy
-import json
-import os
+from game.enemy_manager import EnemyManager
+from game.static_geometry import StaticGeometry
+from game.level_streamer import LevelStreamer
+from game.triggers import TriggerSystem
+from game import level_compiler
 
-class Level:
-    def __init__(self, game_manager):
+class Level(DirectObject):
+    # Extra height above a platform's top that still counts as standing on it
+    TRIGGER_HEIGHT = 3.0
+    OUT_OF_BOUNDS_DEPTH = 10.0  # Thickness of the kill volume below the level
+    
+    def __init__(self, game_manager, seed=None):
+        super().__init__()
         self.game_manager = game_manager
         self.base = game_manager.base
         self.collision_system = game_manager.collision_system
         self.combat_system = game_manager.combat_system
         
-        self.platforms = {}  # Dictionary to store platforms by ID
-        self.enemies = []
+        self.static_geometry = StaticGeometry(self.base)
+        self.platforms = {}  # Dictionary to store platform handles by ID
+        self.platform_colliders = {}  # Height band -> compound platform collider
+        self.streamer = None
+        self.enemy_manager = EnemyManager(self.base, seed=seed)
+        self.combat_system.enemy_manager = self.enemy_manager
         self.spawn_point = Point3(0, 0, 2)  # Default spawn point
         self.current_checkpoint = None
         self.checkpoints = {}  # Dictionary to store checkpoints
         self.victory_pad = None
         self.victory_trigger_height = None
+        self.victory_reached = False
+        self.triggers = TriggerSystem(self.base, self.collision_system)
+        self.level_number = None
+        self.compiled = None  # Kept so restarts can respawn without reloading
         
         # Level bounds
         self.bounds_min = Point3(-15, -15, -10)
         self.bounds_max = Point3(15, 35, 25)
     
     def load_level(self, level_number):
-        """Load a level from the levels directory"""
+        """Load a level from the levels directory (compiled and cached on first use)"""
         try:
-            # Get the absolute path to the level file
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            level_path = os.path.join(base_dir, "assets", "levels", f"level_{level_number}.json")
-            
-            print(f"Loading level from: {level_path}")  # Debug print
-            
-            if not os.path.exists(level_path):
-                print(f"Level file not found: {level_path}")
+            compiled = level_compiler.load_level(self.base, level_number)
+            if compiled is None:
                 return False
             
-            with open(level_path, "r") as f:
-                level_data = json.load(f)
-            
-            # Load spawn point
-            if "spawn_point" in level_data:
-                sp = level_data["spawn_point"]
-                self.spawn_point = Point3(sp[0], sp[1], sp[2])
-            
-            # Load level bounds
-            if "level_bounds" in level_data:
-                bounds = level_data["level_bounds"]
-                self.bounds_min = Point3(*bounds["min"])
-                self.bounds_max = Point3(*bounds["max"])
-            
-            # Load platforms
-            if "platforms" in level_data:
-                for platform in level_data["platforms"]:
-                    # Create platform model (for now using a scaled cube)
-                    platform_model = self.base.loader.loadModel("models/box")
-                    if not platform_model:
-                        print("Failed to load platform model")
-                        continue
-                        
-                    platform_model.reparentTo(self.base.render)
-                    
-                    # Set position
-                    pos = platform["position"]
-                    platform_model.setPos(pos[0], pos[1], pos[2])
-                    
-                    # Set scale
-                    scale = platform.get("scale", [2, 2, 0.5])
-                    platform_model.setScale(scale[0], scale[1], scale[2])
-                    
-                    # Set color
-                    color = platform.get("color", [0.5, 0.5, 0.5, 1])
-                    platform_model.setColor(*color)
-                    
-                    # Create collision shape
-                    self.collision_system.make_collision_from_model(platform_model, mass=0)
-                    
-                    # Store platform by ID if it has one
-                    if "id" in platform:
-                        self.platforms[platform["id"]] = platform_model
-                    
-                    # Special handling for checkpoint and victory platforms
-                    if platform.get("type") == "checkpoint":
-                        self.checkpoints[platform["id"]] = platform_model
-                    elif platform.get("type") == "victory":
-                        self.victory_pad = platform_model
-            
-            # Load checkpoints data
-            if "checkpoints" in level_data:
-                for checkpoint in level_data["checkpoints"]:
-                    if checkpoint["id"] in self.checkpoints:
-                        spawn = checkpoint["spawn_point"]
-                        self.checkpoints[checkpoint["id"]] = {
-                            "model": self.checkpoints[checkpoint["id"]],
-                            "spawn_point": Point3(spawn[0], spawn[1], spawn[2])
-                        }
-            
-            # Load victory conditions
-            if "victory" in level_data:
-                self.victory_trigger_height = level_data["victory"]["trigger_height"]
-            
-            # Load enemies
-            if "enemy_spawns" in level_data:
-                for spawn in level_data["enemy_spawns"]:
-                    pos = spawn["position"]
-                    enemy_type = spawn.get("type", "basic")
-                    
-                    # Create enemy at spawn point
-                    enemy = Enemy(
-                        self.base,
-                        self.collision_system,
-                        self.combat_system,
-                        Point3(pos[0], pos[1], pos[2])
-                    )
-                    self.enemies.append(enemy)
+            self.level_number = level_number
+            if not self.build(compiled):
+                return False
             
             print(f"Successfully loaded level {level_number}")  # Debug print
             return True
@@ -123,31 +60,218 @@ class Level:
             traceback.print_exc()  # Print the full error traceback
             return False
     
-    def check_victory(self, player_pos):
-        """Check if player has reached victory conditions"""
-        if self.victory_pad and self.victory_trigger_height:
-            if player_pos.getZ() >= self.victory_trigger_height:
-                pad_pos = self.victory_pad.getPos()
-                # Check if player is above victory pad (with some tolerance)
-                if (abs(player_pos.getX() - pad_pos.getX()) < 2 and 
-                    abs(player_pos.getY() - pad_pos.getY()) < 2):
-                    return True
-        return False
-    
-    def check_checkpoint(self, player_pos):
-        """Check if player has reached a new checkpoint"""
+    def load_level_data(self, level_data):
+        """Build the level from already-parsed level data (same format as the JSON files)"""
+        try:
+            return self.build(level_compiler.compile_level_data(level_data))
+            
+        except Exception as e:
+            print(f"Error building level: {e}")
+            import traceback
+            traceback.print_exc()  # Print the full error traceback
+            return False
+    
+    def prepare(self, compiled):
+        """Decode a CompiledLevel's visuals and build its collider
+        
+        Nothing is attached to the scene or physics world, so this can run
+        on a loading thread. Returns (visuals, {band: platform collider}) for build.
+        """
+        visuals = compiled.load_visuals(self.base)
+        colliders = {
+            band: self.collision_system.build_static_boxes(boxes, f'level_platforms_{band}')
+            for band, boxes in compiled.collision_bands().items()
+        }
+        return visuals, colliders
+    
+    def build(self, compiled, prepared=None):
+        """Create the level's geometry, colliders and enemies from a CompiledLevel"""
+        for _ in self.build_steps(compiled, prepared):
+            pass
+        return True
+    
+    def build_steps(self, compiled, prepared=None):
+        """Build the level one platform, geometry group or enemy at a time
+        
+        A generator yielding the fraction built so far, so a TimeSlicedJob
+        can spread construction over several frames.
+        """
+        self.compiled = compiled
+        self.static_geometry.band_height = compiled.band_height
+        visuals, colliders = prepared or self.prepare(compiled)
+        
+        # Load spawn point
+        if compiled.spawn_point:
+            self.spawn_point = Point3(*compiled.spawn_point)
+        
+        # Load level bounds
+        if compiled.bounds:
+            self.bounds_min = Point3(*compiled.bounds["min"])
+            self.bounds_max = Point3(*compiled.bounds["max"])
+        
+        # Load platforms into the static geometry batch (cached levels come
+        # with their platforms already flattened into a .bam)
+        platform_count = len(compiled.platforms)
+        for i, (pos, scale, color, platform_type, platform_id) in enumerate(compiled.platforms):
+            if visuals:
+                handle = self.static_geometry.add_handle(
+                    pos, scale, color,
+                    platform_id=platform_id,
+                    platform_type=platform_type
+                )
+            else:
+                handle = self.static_geometry.add_box(
+                    pos, scale, color,
+                    platform_id=platform_id,
+                    platform_type=platform_type
+                )
+            
+            # Store platform by ID if it has one
+            if platform_id is not None:
+                self.platforms[platform_id] = handle
+            
+            # Special handling for checkpoint and victory platforms
+            if platform_type == "checkpoint":
+                self.checkpoints[platform_id] = handle
+            elif platform_type == "victory":
+                self.victory_pad = handle
+            yield 0.5 * (i + 1) / platform_count
+        
+        if compiled.platforms:
+            # Merge all platforms into a few flattened nodes
+            if visuals:
+                self.static_geometry.attach_prebuilt(visuals)
+            else:
+                for fraction in self.static_geometry.build_steps():
+                    yield 0.5 + 0.2 * fraction
+            
+            # One compound collider per height band
+            for band, collider in colliders.items():
+                self.platform_colliders[band] = self.collision_system.attach_body(collider)
+            yield 0.75
+        
+        # Load checkpoints data
+        for checkpoint_id, spawn in compiled.checkpoints:
+            self.checkpoints[checkpoint_id] = {
+                "model": self.checkpoints[checkpoint_id],
+                "spawn_point": Point3(*spawn)
+            }
+        
+        # Load victory conditions
+        if compiled.victory_trigger_height is not None:
+            self.victory_trigger_height = compiled.victory_trigger_height
+        
+        self.make_triggers(compiled)
+        
+        # Load enemies
+        for fraction in self.spawn_enemy_steps():
+            yield 0.75 + 0.25 * fraction
+        
+        # Only the bands around the player stay active from here on
+        self.streamer = LevelStreamer(self.base, self, compiled.band_height)
+    
+    def spawn_enemies(self):
+        """Create an enemy at every spawn point of the compiled level"""
+        for _ in self.spawn_enemy_steps():
+            pass
+    
+    def spawn_enemy_steps(self):
+        """Create the compiled level's enemies one per step, yielding the fraction spawned"""
+        enemy_count = len(self.compiled.enemy_spawns)
+        for i, (pos, enemy_type) in enumerate(self.compiled.enemy_spawns):
+            # Create enemy at spawn point
+            enemy = Enemy(
+                self.base,
+                self.collision_system,
+                self.combat_system,
+                Point3(*pos)
+            )
+            self.enemy_manager.add(enemy)
+            if self.streamer:
+                self.streamer.track(enemy)
+            yield (i + 1) / enemy_count
+    
+    def reset(self):
+        """Put the level's dynamic state back to the start without reloading
+        
+        Platforms, their visuals and colliders stay resident; only the
+        reached checkpoint, enemies and combat state are reset.
+        """
+        for _ in self.reset_steps():
+            pass
+    
+    def reset_steps(self):
+        """reset() as a generator, respawning one enemy per step"""
+        self.current_checkpoint = None
+        self.victory_reached = False
+        if self.streamer:
+            self.streamer.reset()
+        self.enemy_manager.clear()
+        self.combat_system.reset()
+        if self.compiled:
+            yield from self.spawn_enemy_steps()
+    
+    def make_triggers(self, compiled):
+        """Create trigger volumes for checkpoints, the victory pad and the level's floor"""
         for checkpoint_id, checkpoint in self.checkpoints.items():
-            if isinstance(checkpoint, dict):  # New format with spawn point
-                checkpoint_model = checkpoint["model"]
-                checkpoint_pos = checkpoint_model.getPos()
-                # Check if player is on checkpoint platform (with some tolerance)
-                if (abs(player_pos.getX() - checkpoint_pos.getX()) < 2 and 
-                    abs(player_pos.getY() - checkpoint_pos.getY()) < 2 and
-                    abs(player_pos.getZ() - checkpoint_pos.getZ()) < 1):
-                    if self.current_checkpoint != checkpoint_id:
-                        self.current_checkpoint = checkpoint_id
-                        return checkpoint["spawn_point"]
-        return None
+            if isinstance(checkpoint, dict):  # Checkpoint platforms with a spawn point
+                self.add_platform_trigger("checkpoint", checkpoint["model"], data=checkpoint_id)
+        
+        if self.victory_pad:
+            self.add_platform_trigger("victory", self.victory_pad, min_z=self.victory_trigger_height)
+        
+        # Falling below the level's bounds costs a life
+        if compiled.bounds:
+            size = self.bounds_max - self.bounds_min
+            center = (self.bounds_min + self.bounds_max) * 0.5
+            self.triggers.add_box(
+                "out_of_bounds",
+                (center.getX(), center.getY(), self.bounds_min.getZ() - self.OUT_OF_BOUNDS_DEPTH * 0.5),
+                (size.getX() * 0.5 + 50, size.getY() * 0.5 + 50, self.OUT_OF_BOUNDS_DEPTH * 0.5)
+            )
+        
+        self.accept("checkpoint-enter", self.on_checkpoint)
+        self.accept("victory-enter", self.on_victory)
+        self.accept("out_of_bounds-enter", self.on_out_of_bounds)
+    
+    def add_platform_trigger(self, kind, platform, data=None, min_z=None):
+        """Add a trigger volume covering the space just above a platform"""
+        pos, scale = platform.getPos(), platform.getScale()
+        bottom = pos.getZ() + scale.getZ()
+        if min_z is not None:
+            bottom = max(bottom, min_z)
+        return self.triggers.add_box(
+            kind,
+            (pos.getX() + scale.getX() * 0.5, pos.getY() + scale.getY() * 0.5, bottom + self.TRIGGER_HEIGHT * 0.5),
+            (scale.getX() * 0.5, scale.getY() * 0.5, self.TRIGGER_HEIGHT * 0.5),
+            data=data
+        )
+    
+    def get_player(self):
+        """Get the player the level's triggers apply to"""
+        return getattr(self.game_manager, 'player', None)
+    
+    def on_checkpoint(self, volume, owner):
+        """Make a newly reached checkpoint the player's respawn point"""
+        if owner is None or owner is not self.get_player():
+            return
+        checkpoint_id = volume.data
+        if self.current_checkpoint != checkpoint_id:
+            self.current_checkpoint = checkpoint_id
+            owner.set_checkpoint(self.checkpoints[checkpoint_id]["spawn_point"])
+            messenger.send('checkpoint_reached', [checkpoint_id])
+    
+    def on_victory(self, volume, owner):
+        """Announce the player reaching the victory pad"""
+        if owner is None or owner is not self.get_player() or self.victory_reached:
+            return
+        self.victory_reached = True
+        messenger.send('level_complete', [self])
+    
+    def on_out_of_bounds(self, volume, owner):
+        """Take a life from a player who fell out of the level"""
+        if owner is not None and owner is self.get_player():
+            owner.lose_life()
     
     def get_current_spawn_point(self):
         """Get the current spawn point (checkpoint or initial)"""
@@ -157,12 +281,25 @@ class Level:
     
     def cleanup(self):
         """Remove all platforms and clean up the level"""
-        for platform in self.platforms.values():
-            platform.removeNode()
+        self.ignoreAll()
+        self.triggers.cleanup()
+        
+        # Unpark everything first so it is torn down the usual way
+        if self.streamer:
+            self.streamer.cleanup()
+            self.streamer = None
+        
+        self.static_geometry.cleanup()
         self.platforms.clear()
+        
+        for collider in self.platform_colliders.values():
+            self.collision_system.world.removeRigidBody(collider.node())
+            collider.removeNode()
+        self.platform_colliders.clear()
         self.checkpoints.clear()
         self.victory_pad = None
+        self.compiled = None
         
-        for enemy in self.enemies:
-            enemy.cleanup()
-        self.enemies.clear() 
\ No newline at end of file
+        self.enemy_manager.cleanup()
+        if self.combat_system.enemy_manager is self.enemy_manager:
+            self.combat_system.enemy_manager = None 
\ No newline at end of file
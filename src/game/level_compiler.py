@@ -0,0 +1,285 @@
+import hashlib
+import json
+import os
+import struct
+import threading
+
+from panda3d.core import Filename, NodePath
+
+from game.static_geometry import StaticGeometry, height_band
+from systems.log import get_logger
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LEVELS_DIR = os.path.join(BASE_DIR, "assets", "levels")
+CACHE_DIR = os.path.join(BASE_DIR, "cache", "levels")
+
+log = get_logger("level")
+
+# Bump whenever the artifact layout or the compiled visuals change
+FORMAT_VERSION = 3
+MAGIC = b"JLVL"
+
+HEADER = struct.Struct("<4sHHIIII")  # Magic, version, reserved, platforms, checkpoints, enemies, meta bytes
+PLATFORM = struct.Struct("<3f3f4fhh")  # Position, scale, colour, type string, id string (-1 = none)
+CHECKPOINT = struct.Struct("<h3f")  # Id string, spawn point
+ENEMY = struct.Struct("<3fh")  # Position, type string
+
+DEFAULT_SCALE = (2, 2, 0.5)
+DEFAULT_COLOR = (0.5, 0.5, 0.5, 1)
+DEFAULT_BAND_HEIGHT = 10.0  # Height of the bands a level streams in and out by
+
+# Compiled levels already loaded this session, keyed by source path. The
+# lock also serialises compiles, since levels load on a worker thread.
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+class LevelCompileError(ValueError):
+    """Raised when level data fails validation"""
+
+class CompiledLevel:
+    """Validated level data packed into flat arrays
+    
+    Platforms are (position, scale, color, type, id) tuples, checkpoints are
+    (id, spawn_point) and enemy spawns are (position, type). visuals_path
+    points at the pre-flattened .bam when the level came from the cache.
+    """
+    
+    def __init__(self, meta, platforms, checkpoints, enemy_spawns, visuals_path=None):
+        self.meta = meta
+        self.platforms = platforms
+        self.checkpoints = checkpoints
+        self.enemy_spawns = enemy_spawns
+        self.visuals_path = visuals_path
+    
+    @property
+    def name(self):
+        return self.meta.get("name")
+    
+    @property
+    def spawn_point(self):
+        return self.meta.get("spawn_point")
+    
+    @property
+    def bounds(self):
+        return self.meta.get("level_bounds")
+    
+    @property
+    def victory_trigger_height(self):
+        return self.meta.get("victory_trigger_height")
+    
+    @property
+    def band_height(self):
+        return self.meta.get("band_height", DEFAULT_BAND_HEIGHT)
+    
+    def collision_boxes(self):
+        """Get (position, scale) for every platform collider"""
+        return [(platform[0], platform[1]) for platform in self.platforms]
+    
+    def collision_bands(self):
+        """Get platform colliders grouped by height band, as {band: [(position, scale)]}"""
+        bands = {}
+        for pos, scale, _, _, _ in self.platforms:
+            bands.setdefault(height_band(pos[2], self.band_height), []).append((pos, scale))
+        return bands
+    
+    def to_bytes(self):
+        """Pack the level into the binary artifact format"""
+        strings = []
+        index = {}
+        
+        def intern(value):
+            if value is None:
+                return -1
+            if value not in index:
+                index[value] = len(strings)
+                strings.append(value)
+            return index[value]
+        
+        packed = bytearray()
+        for pos, scale, color, platform_type, platform_id in self.platforms:
+            packed += PLATFORM.pack(*pos, *scale, *color, intern(platform_type), intern(platform_id))
+        for checkpoint_id, spawn in self.checkpoints:
+            packed += CHECKPOINT.pack(intern(checkpoint_id), *spawn)
+        for pos, enemy_type in self.enemy_spawns:
+            packed += ENEMY.pack(*pos, intern(enemy_type))
+        
+        meta = json.dumps(dict(self.meta, strings=strings), separators=(",", ":")).encode("utf-8")
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(self.platforms),
+                             len(self.checkpoints), len(self.enemy_spawns), len(meta))
+        return header + meta + bytes(packed)
+    
+    @classmethod
+    def from_bytes(cls, data, visuals_path=None):
+        """Unpack an artifact written by to_bytes"""
+        magic, version, _, platform_count, checkpoint_count, enemy_count, meta_size = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise LevelCompileError(f"Unsupported level artifact (magic {magic!r}, version {version})")
+        
+        offset = HEADER.size
+        meta = json.loads(data[offset:offset + meta_size].decode("utf-8"))
+        offset += meta_size
+        strings = meta.pop("strings")
+        
+        def lookup(i):
+            return strings[i] if i >= 0 else None
+        
+        platforms = []
+        for values in struct.iter_unpack(PLATFORM.format, data[offset:offset + platform_count * PLATFORM.size]):
+            platforms.append((values[0:3], values[3:6], values[6:10], lookup(values[10]), lookup(values[11])))
+        offset += platform_count * PLATFORM.size
+        
+        checkpoints = []
+        for values in struct.iter_unpack(CHECKPOINT.format, data[offset:offset + checkpoint_count * CHECKPOINT.size]):
+            checkpoints.append((lookup(values[0]), values[1:4]))
+        offset += checkpoint_count * CHECKPOINT.size
+        
+        enemy_spawns = []
+        for values in struct.iter_unpack(ENEMY.format, data[offset:offset + enemy_count * ENEMY.size]):
+            enemy_spawns.append((values[0:3], lookup(values[3])))
+        
+        return cls(meta, platforms, checkpoints, enemy_spawns, visuals_path)
+    
+    def load_visuals(self, base):
+        """Load the pre-flattened static geometry, or None without a cached .bam"""
+        if not self.visuals_path:
+            return None
+        return base.loader.loadModel(Filename.fromOsSpecific(self.visuals_path))
+
+def _vector(value, size, what):
+    """Validate a list of numbers of a fixed length"""
+    if (not isinstance(value, (list, tuple)) or len(value) != size or
+            not all(isinstance(v, (int, float)) for v in value)):
+        raise LevelCompileError(f"{what} must be a list of {size} numbers, got {value!r}")
+    return tuple(float(v) for v in value)
+
+def compile_level_data(level_data):
+    """Validate parsed level JSON and pack it into a CompiledLevel"""
+    if not isinstance(level_data, dict):
+        raise LevelCompileError("Level data must be an object")
+    
+    meta = {"name": level_data.get("name")}
+    if "spawn_point" in level_data:
+        meta["spawn_point"] = _vector(level_data["spawn_point"], 3, "spawn_point")
+    if "level_bounds" in level_data:
+        bounds = level_data["level_bounds"]
+        meta["level_bounds"] = {
+            "min": _vector(bounds.get("min"), 3, "level_bounds.min"),
+            "max": _vector(bounds.get("max"), 3, "level_bounds.max"),
+        }
+    if "victory" in level_data:
+        height = level_data["victory"].get("trigger_height")
+        if not isinstance(height, (int, float)):
+            raise LevelCompileError("victory.trigger_height must be a number")
+        meta["victory_trigger_height"] = float(height)
+    
+    band_height = level_data.get("streaming", {}).get("band_height", DEFAULT_BAND_HEIGHT)
+    if not isinstance(band_height, (int, float)) or band_height <= 0:
+        raise LevelCompileError("streaming.band_height must be a positive number")
+    meta["band_height"] = float(band_height)
+    
+    platforms = []
+    checkpoint_platforms = set()
+    seen_ids = set()
+    for i, platform in enumerate(level_data.get("platforms", [])):
+        what = f"platforms[{i}]"
+        pos = _vector(platform.get("position"), 3, f"{what}.position")
+        scale = _vector(platform.get("scale", DEFAULT_SCALE), 3, f"{what}.scale")
+        color = _vector(platform.get("color", DEFAULT_COLOR), 4, f"{what}.color")
+        platform_type = platform.get("type")
+        platform_id = platform.get("id")
+        if platform_id is not None:
+            if platform_id in seen_ids:
+                raise LevelCompileError(f"{what}: duplicate platform id {platform_id!r}")
+            seen_ids.add(platform_id)
+        if platform_type == "checkpoint":
+            if platform_id is None:
+                raise LevelCompileError(f"{what}: checkpoint platforms need an id")
+            checkpoint_platforms.add(platform_id)
+        platforms.append((pos, scale, color, platform_type, platform_id))
+    
+    checkpoints = []
+    checkpoint_ids = set()
+    for i, checkpoint in enumerate(level_data.get("checkpoints", [])):
+        checkpoint_id = checkpoint.get("id")
+        if checkpoint_id not in checkpoint_platforms:
+            raise LevelCompileError(f"checkpoints[{i}]: no checkpoint platform with id {checkpoint_id!r}")
+        if checkpoint_id in checkpoint_ids:
+            raise LevelCompileError(f"checkpoints[{i}]: duplicate checkpoint id {checkpoint_id!r}")
+        checkpoint_ids.add(checkpoint_id)
+        checkpoints.append((checkpoint_id, _vector(checkpoint.get("spawn_point"), 3, f"checkpoints[{i}].spawn_point")))
+    
+    enemy_spawns = []
+    for i, spawn in enumerate(level_data.get("enemy_spawns", [])):
+        enemy_spawns.append((_vector(spawn.get("position"), 3, f"enemy_spawns[{i}].position"), spawn.get("type", "basic")))
+    
+    return CompiledLevel(meta, platforms, checkpoints, enemy_spawns)
+
+def build_visuals(base, compiled, parent):
+    """Batch and flatten a compiled level's platforms under parent, one node per height band"""
+    static_geometry = StaticGeometry(base, parent=parent, band_height=compiled.band_height)
+    for pos, scale, color, platform_type, platform_id in compiled.platforms:
+        static_geometry.add_box(pos, scale, color, platform_id=platform_id, platform_type=platform_type)
+    static_geometry.build()
+    return static_geometry
+
+def source_hash(source):
+    """Hash the level source together with the artifact format version"""
+    digest = hashlib.sha256(FORMAT_VERSION.to_bytes(4, "little") + source)
+    return digest.hexdigest()[:16]
+
+def compile_level_file(base, level_path, cache_dir=CACHE_DIR):
+    """Get the compiled artifact for a level file, compiling it on a cache miss"""
+    with open(level_path, "rb") as f:
+        source = f.read()
+    
+    stem = os.path.splitext(os.path.basename(level_path))[0]
+    key = source_hash(source)
+    artifact_path = os.path.join(cache_dir, f"{stem}-{key}.jlvl")
+    visuals_path = os.path.join(cache_dir, f"{stem}-{key}.bam")
+    
+    if os.path.exists(artifact_path) and os.path.exists(visuals_path):
+        try:
+            with open(artifact_path, "rb") as f:
+                return CompiledLevel.from_bytes(f.read(), visuals_path)
+        except (LevelCompileError, struct.error, ValueError) as e:
+            log.warning("Recompiling %s: cached artifact unreadable (%s)", stem, e)
+    
+    log.info("Compiling %s", level_path)
+    compiled = compile_level_data(json.loads(source.decode("utf-8")))
+    
+    # Bake the flattened visuals into a .bam next to the packed arrays
+    os.makedirs(cache_dir, exist_ok=True)
+    static_geometry = build_visuals(base, compiled, NodePath(stem))
+    static_geometry.root.writeBamFile(Filename.fromOsSpecific(visuals_path))
+    static_geometry.cleanup()
+    with open(artifact_path, "wb") as f:
+        f.write(compiled.to_bytes())
+    compiled.visuals_path = visuals_path
+    
+    # Drop artifacts for older versions of this level
+    for name in os.listdir(cache_dir):
+        if name.startswith(f"{stem}-") and not name.startswith(f"{stem}-{key}."):
+            os.remove(os.path.join(cache_dir, name))
+    return compiled
+
+def load_level(base, level_number, levels_dir=LEVELS_DIR, cache_dir=CACHE_DIR):
+    """Get a compiled level by number, or None if its file doesn't exist
+    
+    Levels stay in memory once loaded, so restarting only re-reads a
+    level if its source file changed.
+    """
+    level_path = os.path.join(levels_dir, f"level_{level_number}.json")
+    if not os.path.exists(level_path):
+        log.warning("Level file not found: %s", level_path)
+        return None
+    
+    stat = os.stat(level_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _loaded_lock:
+        cached = _loaded.get(level_path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        
+        compiled = compile_level_file(base, level_path, cache_dir)
+        _loaded[level_path] = (stamp, compiled)
+        return compiled
@@ -0,0 +1,133 @@
+import threading
+import traceback
+
+from game import level_compiler
+from systems.time_slicer import TimeSlicedJob
+
+class LevelLoader:
+    """Loads a level in the background and attaches it on the main thread
+    
+    A worker thread reads and decodes the arena model and the level file
+    (compiling it on a cache miss) and builds their colliders. Nothing it
+    makes touches the scene graph or physics world; a polling task then
+    attaches the results and spawns enemies, time-sliced to budget_ms per
+    frame. progress (0..1) and stage describe how far along it is, for a
+    loading screen.
+    """
+    BUILD_START = 0.9  # Share of progress reported by the worker
+    
+    def __init__(self, base, level, level_number, arena_path=None, budget_ms=4.0):
+        self.base = base
+        self.level = level
+        self.level_number = level_number
+        self.arena_path = arena_path
+        self.budget_ms = budget_ms
+        
+        self.progress = 0.0
+        self.stage = "Starting"
+        self.done_callback = None
+        self.finished = threading.Event()
+        self.cancelled = False
+        
+        # Worker results, read by the main thread after finished is set
+        self.arena = None
+        self.arena_collision = None
+        self.compiled = None
+        self.prepared = None
+        self.error = None
+        
+        self.thread = None
+        self.build_job = None
+    
+    def start(self, done_callback=None):
+        """Start loading; done_callback(success) runs on the main thread when the level is in"""
+        self.done_callback = done_callback
+        self.thread = threading.Thread(target=self._work, name="level_loader", daemon=True)
+        self.thread.start()
+        self.base.taskMgr.add(self.poll, "level_loader_poll")
+    
+    def _set_stage(self, progress, stage):
+        self.progress = progress
+        self.stage = stage
+    
+    def _work(self):
+        """Worker thread: file I/O, decoding and collider construction"""
+        try:
+            if self.arena_path:
+                self._set_stage(0.05, "Loading arena")
+                self.arena = self.base.loader.loadModel(self.arena_path)
+                self._set_stage(0.25, "Building arena collision")
+                self.arena_collision = self.base.collision_system.build_collision_from_model(self.arena, mass=0)
+            
+            self._set_stage(0.45, "Reading level")
+            self.compiled = level_compiler.load_level(self.base, self.level_number)
+            if self.compiled is None:
+                raise level_compiler.LevelCompileError(f"Level {self.level_number} not found")
+            
+            self._set_stage(0.65, "Building level")
+            self.prepared = self.level.prepare(self.compiled)
+            self._set_stage(self.BUILD_START, "Placing level")
+        except Exception as e:
+            self.error = e
+            traceback.print_exc()
+        finally:
+            self.finished.set()
+    
+    def poll(self, task):
+        """Attach the worker's results a slice at a time once it is done"""
+        if self.cancelled:
+            return task.done
+        if not self.finished.is_set():
+            return task.cont
+        
+        if self.error is not None:
+            print(f"Error loading level {self.level_number}: {self.error}")
+            self._done(False)
+            return task.done
+        
+        if self.build_job is None:
+            self.attach_arena()
+            self.level.level_number = self.level_number
+            self.build_job = TimeSlicedJob(
+                self.base, self.level.build_steps(self.compiled, self.prepared),
+                "level_build", budget_ms=self.budget_ms
+            )
+        
+        try:
+            finished = self.build_job.run_slice()
+        except Exception as e:
+            print(f"Error building level {self.level_number}: {e}")
+            traceback.print_exc()
+            self._done(False)
+            return task.done
+        
+        self.progress = self.BUILD_START + (1.0 - self.BUILD_START) * self.build_job.progress
+        if not finished:
+            return task.cont
+        
+        print(f"Successfully loaded level {self.level_number}")
+        self._done(True)
+        return task.done
+    
+    def attach_arena(self):
+        """Main thread: put the loaded arena and its collider into the scene and world"""
+        if self.arena:
+            self.arena.reparentTo(self.base.render)
+            self.base.collision_system.attach_body(self.arena_collision)
+            
+            # Hand them to the game now so unloading removes them even if the build is cancelled
+            self.base.arena = self.arena
+            self.base.arena_collision = self.arena_collision
+    
+    def _done(self, success):
+        self.progress = 1.0
+        self.stage = "Done" if success else "Failed"
+        if self.done_callback:
+            self.done_callback(success)
+    
+    def cancel(self):
+        """Stop waiting for the worker; anything it loads is discarded"""
+        self.cancelled = True
+        self.base.taskMgr.remove("level_loader_poll")
+        if self.build_job:
+            self.build_job.cancel()
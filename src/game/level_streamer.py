@@ -0,0 +1,109 @@
+from game.static_geometry import height_band
+
+class LevelStreamer:
+    """Keeps only the height bands around the player active
+    
+    Levels are split into horizontal bands band_height tall. Bands within
+    radius bands of the player's band are active: their platforms are
+    drawn, their colliders are in the physics world and their enemies run
+    AI. Other bands are parked: platform visuals are stashed, colliders
+    are taken out of the world and enemies are taken out of the world and
+    the enemy manager. Work is only done when the player changes band.
+    """
+    
+    def __init__(self, base, level, band_height, radius=1):
+        self.base = base
+        self.level = level
+        self.band_height = band_height
+        self.radius = radius
+        
+        self.center = None  # Band the player was last in
+        self.parked_bands = set()
+        self.parked_enemies = {}  # Band -> enemies parked with it
+        
+        self.base.taskMgr.add(self.update, "level_streamer_update")
+    
+    def band_of(self, z):
+        """Get the band containing a height"""
+        return height_band(z, self.band_height)
+    
+    def is_active(self, band):
+        """Check whether a band is within radius of the player's band"""
+        return self.center is None or abs(band - self.center) <= self.radius
+    
+    def update(self, task):
+        """Re-stream when the player moves into another band"""
+        player = getattr(self.base, 'player', None)
+        if player:
+            band = self.band_of(player.physics_node.getZ())
+            if band != self.center:
+                self.set_center(band)
+        return task.cont
+    
+    def set_center(self, band):
+        """Activate the bands around band and park the rest"""
+        self.center = band
+        
+        # Static platforms: visuals and colliders
+        for platform_band in set(self.level.platform_colliders) | set(self.level.static_geometry.bands):
+            active = self.is_active(platform_band)
+            if active and platform_band in self.parked_bands:
+                self.set_band_active(platform_band, True)
+            elif not active and platform_band not in self.parked_bands:
+                self.set_band_active(platform_band, False)
+        
+        # Bring back enemies whose band is active again
+        manager = self.level.enemy_manager
+        for enemy_band in [b for b in self.parked_enemies if self.is_active(b)]:
+            for enemy in self.parked_enemies.pop(enemy_band):
+                enemy.unpark(manager)
+        
+        # Park live enemies that are now out of range
+        for enemy in list(manager.enemies):
+            self.track(enemy)
+    
+    def track(self, enemy):
+        """Park a newly spawned enemy straight away if its band is streamed out"""
+        enemy_band = self.band_of(enemy.physics_node.getZ())
+        if not self.is_active(enemy_band):
+            enemy.park()
+            self.parked_enemies.setdefault(enemy_band, []).append(enemy)
+    
+    def set_band_active(self, band, active):
+        """Show and attach, or stash and detach, one band's platforms"""
+        self.level.static_geometry.set_band_visible(band, active)
+        collider = self.level.platform_colliders.get(band)
+        if collider:
+            if active:
+                self.level.collision_system.world.attachRigidBody(collider.node())
+            else:
+                self.level.collision_system.world.removeRigidBody(collider.node())
+        if active:
+            self.parked_bands.discard(band)
+        else:
+            self.parked_bands.add(band)
+    
+    def active_counts(self):
+        """Get (active enemies, parked enemies, parked bands) for debugging"""
+        parked = sum(len(enemies) for enemies in self.parked_enemies.values())
+        return len(self.level.enemy_manager), parked, len(self.parked_bands)
+    
+    def clear_parked_enemies(self):
+        """Clean up every parked enemy"""
+        for enemies in self.parked_enemies.values():
+            for enemy in enemies:
+                enemy.cleanup()
+        self.parked_enemies.clear()
+    
+    def reset(self):
+        """Forget parked enemies (the level is respawning them) and re-stream next frame"""
+        self.clear_parked_enemies()
+        self.center = None
+    
+    def cleanup(self):
+        """Stop streaming and reactivate every band so the level can be torn down"""
+        self.base.taskMgr.remove("level_streamer_update")
+        self.clear_parked_enemies()
+        for band in list(self.parked_bands):
+            self.set_band_active(band, True)
+        self.center = None
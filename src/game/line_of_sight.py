@@ -0,0 +1,135 @@
+from direct.showbase.ShowBaseGlobal import globalClock
+from panda3d.core import Point3, Vec3
+
+EYE_OFFSET = Vec3(0, 0, 1)  # Rays go from eye level to eye level
+
+class LineOfSightEntry:
+    """Cached visibility result for one enemy"""
+    __slots__ = ('visible', 'start', 'end', 'hit_pos', 'hit_node', 'frame', 'expires')
+    
+    def __init__(self):
+        self.visible = False
+        self.start = None
+        self.end = None
+        self.hit_pos = None
+        self.hit_node = None
+        self.frame = -1
+        self.expires = 0.0
+
+
+class LineOfSightService:
+    """Caches enemy-to-player visibility and bounds raycasts per frame"""
+    
+    def __init__(self, base, refresh_interval=0.25, move_threshold=0.5, max_rays_per_frame=4):
+        self.base = base
+        self.refresh_interval = refresh_interval  # Seconds a result stays valid
+        self.move_threshold = move_threshold  # Endpoint movement that invalidates a result
+        self.max_rays_per_frame = max_rays_per_frame
+        
+        self.entries = {}  # Enemy -> LineOfSightEntry
+        self.budget_frame = -1
+        self.rays_this_frame = 0
+        self.stagger = 0  # Spreads expiry times so refreshes don't bunch up
+    
+    def get_endpoints(self, enemy):
+        """Get the eye-level ray endpoints between an enemy and the player"""
+        start = enemy.physics_node.getPos() + EYE_OFFSET
+        end = self.base.player.physics_node.getPos() + EYE_OFFSET
+        return start, end
+    
+    def _is_stale(self, entry, start, end, now):
+        """Check whether a cached result has expired or its endpoints moved"""
+        if entry.start is None or now >= entry.expires:
+            return True
+        threshold_sq = self.move_threshold * self.move_threshold
+        return ((start - entry.start).lengthSquared() > threshold_sq or
+                (end - entry.end).lengthSquared() > threshold_sq)
+    
+    def _take_ray(self, frame):
+        """Consume one raycast from this frame's budget"""
+        if frame != self.budget_frame:
+            self.budget_frame = frame
+            self.rays_this_frame = 0
+        if self.rays_this_frame >= self.max_rays_per_frame:
+            return False
+        self.rays_this_frame += 1
+        return True
+    
+    def check(self, enemy):
+        """Check if enemy has line of sight to player, refreshing when due"""
+        if not hasattr(self.base, 'player'):
+            return False
+        
+        entry = self.entries.get(enemy)
+        if entry is None:
+            entry = self.entries[enemy] = LineOfSightEntry()
+        
+        start, end = self.get_endpoints(enemy)
+        now = globalClock.getFrameTime()
+        frame = globalClock.getFrameCount()
+        if self._is_stale(entry, start, end, now) and self._take_ray(frame):
+            self.refresh(entry, start, end, now, frame)
+        return entry.visible
+    
+    def refresh(self, entry, start, end, now, frame):
+        """Cast the visibility ray and store the result"""
+        collision_system = self.base.collision_system
+        result = collision_system.world.rayTestClosest(
+            start,
+            end,
+            collision_system.MASK_TERRAIN | collision_system.MASK_PLAYER
+        )
+        
+        entry.start = Point3(start)
+        entry.end = Point3(end)
+        entry.frame = frame
+        self.stagger = (self.stagger + 1) % 8
+        entry.expires = now + self.refresh_interval * (1.0 + self.stagger / 16.0)
+        
+        if result.hasHit():
+            entry.hit_pos = Point3(result.getHitPos())
+            entry.hit_node = result.getNode()
+            
+            # If we hit the player, that's a valid line of sight
+            if entry.hit_node and entry.hit_node.hasPythonTag('owner'):
+                if entry.hit_node.getPythonTag('owner') == self.base.player:
+                    entry.visible = True
+                    return
+            
+            # If we hit something else, check if it's closer than the player
+            hit_dist = (entry.hit_pos - start).length()
+            player_dist = (end - start).length()
+            entry.visible = hit_dist >= player_dist
+        else:
+            # If no obstacles hit, we have line of sight
+            entry.hit_pos = None
+            entry.hit_node = None
+            entry.visible = True
+    
+    def get_fresh_hit(self, enemy, start, direction=None):
+        """Get (hit_pos, hit_node) from a ray cast this frame along the same line
+        
+        Returns None when there is no fresh hit to reuse, in which case the
+        caller should cast its own ray.
+        """
+        entry = self.entries.get(enemy)
+        if entry is None or entry.hit_pos is None:
+            return None
+        if entry.frame != globalClock.getFrameCount():
+            return None
+        if (start - entry.start).lengthSquared() > 1e-6:
+            return None
+        if direction is not None:
+            los_direction = entry.end - entry.start
+            los_direction.normalize()
+            if los_direction.dot(direction) < 0.9999:
+                return None
+        return entry.hit_pos, entry.hit_node
+    
+    def forget(self, enemy):
+        """Drop the cached result for an enemy"""
+        self.entries.pop(enemy, None)
+    
+    def clear(self):
+        """Drop every cached result"""
+        self.entries.clear()
@@ -4,18 +4,31 @@ from direct.showbase.MessengerGlobal import messenger
 from panda3d.core import BitMask32, Point3, Vec3
 from panda3d.core import WindowProperties, TextNode, NodePath, PandaNode
 from game.camera import ThirdPersonCamera
+from game.player_stats import PlayerStats, stat_property
 import math
 from direct.gui.OnscreenImage import OnscreenImage
 from direct.actor.Actor import Actor
 from direct.interval.IntervalGlobal import Sequence, Wait, LerpPosInterval
 from direct.gui.DirectWaitBar import DirectWaitBar
+from systems.log import get_logger
+
+log = get_logger("player")
 
 class Player(DirectObject):
+    # Stats live on an observable component that publishes change events
+    health = stat_property('health')
+    max_health = stat_property('max_health')
+    lives = stat_property('lives')
+    max_lives = stat_property('max_lives')
+    is_invulnerable = stat_property('is_invulnerable')
+    respawn_point = stat_property('checkpoint')
+    
     def __init__(self, base, collision_system, combat_system=None):
         super().__init__()
         self.base = base
         self.collision_system = collision_system
         self.combat_system = combat_system
+        self.stats = PlayerStats(base)
         
         # Create physics character controller
         self.physics_node = self.collision_system.setup_player(self)
@@ -23,9 +36,12 @@ class Player(DirectObject):
         # Set python tag for combat system
         self.physics_node.setPythonTag('owner', self)
         
+        # Visuals follow an interpolated proxy between physics ticks
+        self.interpolation = self.collision_system.add_interpolation(self.physics_node)
+        self.visual_root = self.interpolation.node
+        
         # Create visual representation (temporary cube)
-        self.actor = self.base.loader.loadModel("models/box")
-        self.actor.reparentTo(self.physics_node)
+        self.actor = self.base.asset_cache.instance("models/box", self.visual_root, "player_body")
         self.actor.setScale(1, 1, 2)  # Make it a tall box for now
         self.actor.setPos(-0.5, -0.5, -1)  # Center it on the physics capsule
         self.actor.setColor(1, 0, 0, 1)  # Red color
@@ -71,7 +87,7 @@ class Player(DirectObject):
         self.invulnerability_timer = 0
         
         # Create camera controller
-        self.camera = ThirdPersonCamera(base, self.physics_node)
+        self.camera = ThirdPersonCamera(base, self.visual_root)
         self.heading = 0
         
         # Set up controls
@@ -113,6 +129,11 @@ class Player(DirectObject):
         # Start with cursor visible and no mouse control
         self.mouse_enabled = False
         
+        # Optional input hooks: a recorder captures each frame's input and a
+        # source (e.g. InputReplay) replaces the live mouse
+        self.input_recorder = None
+        self.input_source = None
+        
         # Add first-person camera variables
         self.pitch = 0  # Track camera pitch separately
         self.mouse_sensitivity = 0.15  # Reduced sensitivity for smoother control
@@ -122,24 +143,24 @@ class Player(DirectObject):
         
         # Add gun model
         self.player_gun = None
+        self.gun_parts = []
         try:
             print("Creating simple gun model")
             # Create gun parts
             self.player_gun = self.base.render.attachNewNode("gun")
             
             # Create barrel (long cylinder)
-            barrel = self.base.loader.loadModel("models/box")
-            barrel.reparentTo(self.player_gun)
+            barrel = self.base.asset_cache.instance("models/box", self.player_gun, "gun_barrel")
             barrel.setScale(0.1, 0.5, 0.1)  # Long and thin
             barrel.setPos(0, 0.5, 0)  # Extend forward
             barrel.setColor(0.2, 0.2, 0.2, 1)  # Dark gray
             
             # Create handle (box)
-            handle = self.base.loader.loadModel("models/box")
-            handle.reparentTo(self.player_gun)
+            handle = self.base.asset_cache.instance("models/box", self.player_gun, "gun_handle")
             handle.setScale(0.1, 0.15, 0.3)  # Tall for grip
             handle.setPos(0, 0, -0.2)  # Below barrel
             handle.setColor(0.3, 0.3, 0.3, 1)  # Slightly lighter gray
+            self.gun_parts = [barrel, handle]
             
             # Position gun relative to camera
             self.player_gun.reparentTo(self.base.camera)
@@ -170,13 +191,19 @@ class Player(DirectObject):
     def updateKey(self, key, value):
         """Update the state of a key"""
         if key == "jump":
-            print(f"Jump key {'pressed' if value else 'released'}")
+            log.debug("Jump key %s", "pressed" if value else "released")
         self.keys[key] = value
         
         # Handle running state
         if key == "run":
             self.move_speed = self.run_speed if value else self.walk_speed
     
+    def release_keys(self):
+        """Let go of every held key, e.g. when the game is paused"""
+        for key, held in self.keys.items():
+            if held:
+                self.updateKey(key, False)
+    
     def take_damage(self, amount, knockback=None):
         """Handle player taking damage"""
         if self.is_invulnerable or self.health <= 0:  # Added check for health <= 0
@@ -187,10 +214,6 @@ class Player(DirectObject):
         if not self.is_dodging:  # Invulnerable while dodging
             self.health = max(0, self.health - amount)
             
-            # Notify HUD of health change
-            if hasattr(self.base, 'hud'):
-                self.base.hud.update_health(self.health, self.max_health)
-            
             # Apply knockback if provided, but prevent falling through ground
             if knockback:
                 current_pos = self.physics_node.getPos()
@@ -209,10 +232,6 @@ class Player(DirectObject):
         """Handle losing a life"""
         self.lives -= 1
         
-        # Update HUD with new lives count
-        if hasattr(self.base, 'hud'):
-            self.base.hud.update_lives(self.lives)
-        
         if self.lives > 0:
             print(f"Lives remaining: {self.lives}")
             self.respawn()
@@ -239,15 +258,12 @@ class Player(DirectObject):
         spawn_pos = Point3(self.respawn_point)
         spawn_pos.setZ(max(spawn_pos.getZ(), 2.0))  # Ensure at least 2 units above ground
         self.physics_node.setPos(spawn_pos)
+        self.interpolation.snap()
         
         # Set invulnerability
         self.is_invulnerable = True
         self.invulnerability_timer = self.invulnerability_duration
         
-        # Notify HUD of health reset
-        if hasattr(self.base, 'hud'):
-            self.base.hud.update_health(self.health, self.max_health)
-        
         # Reset movement states
         self.can_double_jump = True
         self.has_double_jumped = False
@@ -259,6 +275,26 @@ class Player(DirectObject):
         
         print(f"Player respawned at position: {spawn_pos}, invulnerable for {self.invulnerability_duration} seconds")
     
+    def reset(self, spawn_point):
+        """Put the player back in their level-start state at spawn_point"""
+        if self.is_in_firing_mode:
+            self.toggle_firing_mode()
+        for key in self.keys:
+            self.keys[key] = False
+        self.move_speed = self.walk_speed
+        self.is_running = False
+        self.is_blocking = False
+        self.dodge_time_remaining = 0
+        self.physics_node.node().setLinearMovement(Vec3(0, 0, 0), True)
+        
+        self.lives = 3
+        self.set_checkpoint(spawn_point)
+        self.respawn()
+        
+        # A fresh start has no spawn protection
+        self.is_invulnerable = False
+        self.invulnerability_timer = 0
+    
     def set_checkpoint(self, point):
         """Set a new respawn point"""
         self.respawn_point = Point3(point)
@@ -266,9 +302,6 @@ class Player(DirectObject):
     def heal(self, amount):
         """Heal the player"""
         self.health = min(self.max_health, self.health + amount)
-        # Notify HUD of health change
-        if hasattr(self.base, 'hud'):
-            self.base.hud.update_health(self.health, self.max_health)
     
     def perform_attack(self):
         """Perform shooting attack"""
@@ -320,7 +353,7 @@ class Player(DirectObject):
             current_p = self.base.camera.getP()
             
             # Switch to first person view
-            self.base.camera.reparentTo(self.physics_node)
+            self.base.camera.reparentTo(self.visual_root)
             self.base.camera.setPos(0, 0, 1.5)  # Up from player center
             self.base.camera.setHpr(current_h, current_p, 0)  # Maintain camera orientation
             self.heading = current_h
@@ -366,6 +399,26 @@ class Player(DirectObject):
             quat = self.physics_node.getQuat(self.base.render)
             return quat
     
+    def read_mouse(self):
+        """Get this frame's (x, y) mouse offset and re-center the pointer
+        
+        Returns None when mouse control is off or there is no mouse input.
+        """
+        if self.input_source:
+            return self.input_source.get_mouse(self)
+        
+        if not (self.mouse_enabled and self.base.mouseWatcherNode.hasMouse()):
+            return None
+        
+        mouse_x = self.base.mouseWatcherNode.getMouseX()
+        mouse_y = self.base.mouseWatcherNode.getMouseY()
+        
+        # Center the mouse
+        self.base.win.movePointer(0, 
+            int(self.base.win.getXSize() / 2), 
+            int(self.base.win.getYSize() / 2))
+        return mouse_x, mouse_y
+    
     def update(self, task):
         """Update player position and state"""
         dt = globalClock.getDt()
@@ -409,13 +462,13 @@ class Player(DirectObject):
             if not self.jump_pressed:  # Only jump if key wasn't pressed last frame
                 if on_ground:
                     # Regular jump
-                    print("Performing regular jump")
+                    log.debug("Performing regular jump")
                     self.physics_node.node().setJumpSpeed(self.jump_speed)
                     self.physics_node.node().doJump()
                     self.jump_pressed = True
                 elif self.can_double_jump and not self.has_double_jumped:
                     # Double jump
-                    print("Performing double jump")
+                    log.debug("Performing double jump")
                     # Apply an upward impulse for double jump
                     self.physics_node.node().setLinearMovement(Vec3(0, 0, self.jump_speed), False)
                     self.has_double_jumped = True
@@ -425,24 +478,14 @@ class Player(DirectObject):
             self.jump_pressed = False  # Reset when key is released
         
         # Only process mouse movement if enabled
-        mouse_x = 0
-        mouse_y = 0
-        if self.mouse_enabled and self.base.mouseWatcherNode.hasMouse():
-            mouse_x = self.base.mouseWatcherNode.getMouseX()
-            mouse_y = self.base.mouseWatcherNode.getMouseY()
-            
-            # Center the mouse
-            self.base.win.movePointer(0, 
-                int(self.base.win.getXSize() / 2), 
-                int(self.base.win.getYSize() / 2))
+        mouse = self.read_mouse()
+        mouse_x, mouse_y = mouse or (0, 0)
+        if self.input_recorder:
+            self.input_recorder.capture(self, dt, mouse)
         
         # Handle camera movement
         if self.is_in_firing_mode:
-            if self.mouse_enabled and self.base.mouseWatcherNode.hasMouse():
-                # Get mouse movement
-                mouse_x = self.base.mouseWatcherNode.getMouseX()
-                mouse_y = self.base.mouseWatcherNode.getMouseY()
-                
+            if mouse:
                 # Update target heading and pitch
                 self.target_heading -= mouse_x * self.mouse_sensitivity * 100
                 self.target_pitch += mouse_y * self.mouse_sensitivity * 100
@@ -457,11 +500,6 @@ class Player(DirectObject):
                 # Apply camera rotation
                 self.physics_node.setH(self.heading)
                 self.base.camera.setP(self.pitch)
-                
-                # Center the mouse
-                self.base.win.movePointer(0, 
-                    int(self.base.win.getXSize() / 2), 
-                    int(self.base.win.getYSize() / 2))
         else:
             # Third person camera update
             self.heading = self.camera.update(dt, mouse_x, mouse_y, self.mouse_enabled)
@@ -530,12 +568,16 @@ class Player(DirectObject):
         """Clean up player resources"""
         # Remove tasks
         self.base.taskMgr.remove("player_update")
+        self.stats.cleanup()
         
         # Clean up camera
         if self.camera:
             self.camera.cleanup()
         
         # Clean up gun model
+        for part in self.gun_parts:
+            self.base.asset_cache.release(part)
+        self.gun_parts = []
         if self.player_gun:
             self.player_gun.removeNode()
         
@@ -545,10 +587,12 @@ class Player(DirectObject):
         
         # Clean up actor
         if self.actor:
-            self.actor.removeNode()
+            self.base.asset_cache.release(self.actor)
         
         # Clean up physics node
+        self.collision_system.remove_interpolation(self.interpolation)
         if self.physics_node:
+            self.collision_system.world.removeCharacter(self.physics_node.node())
             self.physics_node.removeNode()
         
         # Ignore all events
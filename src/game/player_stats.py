@@ -0,0 +1,98 @@
+from direct.showbase.MessengerGlobal import messenger
+from panda3d.core import Point3
+
+def differs(a, b):
+    """Compare stat values, treating None as only equal to None"""
+    if a is None or b is None:
+        return a is not b
+    return a != b
+
+class Stat:
+    """An observable, typed field on PlayerStats
+    
+    Assigning a different value records the change; assigning the same
+    value again is free.
+    """
+    
+    def __init__(self, kind, default):
+        self.kind = kind
+        self.default = default
+        self.name = None
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, stats, owner=None):
+        if stats is None:
+            return self
+        return stats.values[self.name]
+    
+    def __set__(self, stats, value):
+        if value is not None and not isinstance(value, self.kind):
+            value = self.kind(value)
+        old = stats.values[self.name]
+        if differs(old, value):
+            stats.values[self.name] = value
+            stats.mark_changed(self.name, old)
+
+def stat_property(name):
+    """Expose a PlayerStats field as a plain attribute on the owning object"""
+    return property(
+        lambda owner: getattr(owner.stats, name),
+        lambda owner, value: setattr(owner.stats, name, value),
+        doc=f"Observable {name} (see PlayerStats)"
+    )
+
+class PlayerStats:
+    """Player health, lives, invulnerability and checkpoint, published as events
+    
+    Every change made during a frame is coalesced and sent once, late in
+    the frame, as the 'player_stats_changed' event with arguments
+    (stats, changes), where changes maps each changed stat to its new value.
+    Stats that change and then change back within the frame are not sent.
+    """
+    EVENT = 'player_stats_changed'
+    
+    health = Stat(float, 100.0)
+    max_health = Stat(int, 100)
+    lives = Stat(int, 3)
+    max_lives = Stat(int, 5)
+    is_invulnerable = Stat(bool, False)
+    checkpoint = Stat(Point3, None)
+    
+    STATS = ('health', 'max_health', 'lives', 'max_lives', 'is_invulnerable', 'checkpoint')
+    
+    def __init__(self, base):
+        self.base = base
+        self.values = {name: getattr(PlayerStats, name).default for name in self.STATS}
+        self.pending = {}  # Stat name -> value at the start of the frame
+        
+        # Publish after gameplay tasks (sort 0) and before rendering (sort 50)
+        self.base.taskMgr.add(self.flush, "player_stats_flush", sort=45)
+    
+    def mark_changed(self, name, old):
+        """Remember a stat's pre-change value until the end of the frame"""
+        if name not in self.pending:
+            self.pending[name] = old
+    
+    def snapshot(self):
+        """Get every stat's current value"""
+        return dict(self.values)
+    
+    def flush(self, task=None):
+        """Send one notification for everything that changed this frame"""
+        if self.pending:
+            changes = {
+                name: self.values[name]
+                for name, old in self.pending.items()
+                if differs(self.values[name], old)
+            }
+            self.pending.clear()
+            if changes:
+                messenger.send(self.EVENT, [self, changes])
+        return task.cont if task else None
+    
+    def cleanup(self):
+        """Stop publishing"""
+        self.base.taskMgr.remove("player_stats_flush")
+        self.pending.clear()
@@ -0,0 +1,109 @@
+import heapq
+import math
+
+class SpatialHash:
+    """Uniform grid index for answering range and nearest-neighbour queries"""
+    
+    def __init__(self, cell_size=10.0):
+        self.cell_size = cell_size
+        self.cells = {}  # (ix, iy, iz) -> set of items
+        self.positions = {}  # item -> (x, y, z)
+        self.item_cells = {}  # item -> cell key
+    
+    def _cell(self, x, y, z):
+        """Get the cell key containing a point"""
+        size = self.cell_size
+        return (int(math.floor(x / size)), int(math.floor(y / size)), int(math.floor(z / size)))
+    
+    def __len__(self):
+        return len(self.positions)
+    
+    def __contains__(self, item):
+        return item in self.positions
+    
+    def insert(self, item, pos):
+        """Add an item or move it to a new position"""
+        x, y, z = pos[0], pos[1], pos[2]
+        key = self._cell(x, y, z)
+        old_key = self.item_cells.get(item)
+        if old_key != key:
+            if old_key is not None:
+                self._discard(item, old_key)
+            self.cells.setdefault(key, set()).add(item)
+            self.item_cells[item] = key
+        self.positions[item] = (x, y, z)
+    
+    update = insert
+    
+    def remove(self, item):
+        """Remove an item from the index"""
+        key = self.item_cells.pop(item, None)
+        if key is not None:
+            self._discard(item, key)
+        self.positions.pop(item, None)
+    
+    def _discard(self, item, key):
+        """Remove an item from a cell, dropping the cell when empty"""
+        cell = self.cells.get(key)
+        if cell is not None:
+            cell.discard(item)
+            if not cell:
+                del self.cells[key]
+    
+    def clear(self):
+        """Remove every item"""
+        self.cells.clear()
+        self.positions.clear()
+        self.item_cells.clear()
+    
+    def _cells_in_radius(self, x, y, z, radius):
+        """Yield the non-empty cells overlapping a sphere's bounding box"""
+        min_key = self._cell(x - radius, y - radius, z - radius)
+        max_key = self._cell(x + radius, y + radius, z + radius)
+        span = (max_key[0] - min_key[0] + 1) * (max_key[1] - min_key[1] + 1) * (max_key[2] - min_key[2] + 1)
+        
+        # With a huge radius it is cheaper to walk the occupied cells
+        if span > len(self.cells):
+            for key, cell in self.cells.items():
+                if (min_key[0] <= key[0] <= max_key[0] and
+                        min_key[1] <= key[1] <= max_key[1] and
+                        min_key[2] <= key[2] <= max_key[2]):
+                    yield cell
+            return
+        
+        for ix in range(min_key[0], max_key[0] + 1):
+            for iy in range(min_key[1], max_key[1] + 1):
+                for iz in range(min_key[2], max_key[2] + 1):
+                    cell = self.cells.get((ix, iy, iz))
+                    if cell:
+                        yield cell
+    
+    def query_radius(self, pos, radius):
+        """Get (item, distance) pairs within radius of a point"""
+        x, y, z = pos[0], pos[1], pos[2]
+        radius_sq = radius * radius
+        results = []
+        for cell in self._cells_in_radius(x, y, z, radius):
+            for item in cell:
+                ix, iy, iz = self.positions[item]
+                dist_sq = (ix - x) ** 2 + (iy - y) ** 2 + (iz - z) ** 2
+                if dist_sq <= radius_sq:
+                    results.append((item, math.sqrt(dist_sq)))
+        return results
+    
+    def nearest(self, pos, count=1, max_radius=None):
+        """Get up to count (item, distance) pairs closest to a point"""
+        x, y, z = pos[0], pos[1], pos[2]
+        if not self.positions:
+            return []
+        
+        # Grow the search radius ring by ring until enough items are found
+        radius = self.cell_size
+        while True:
+            found = self.query_radius((x, y, z), radius)
+            covers_all = len(found) == len(self.positions)
+            if len(found) >= count or covers_all or (max_radius is not None and radius >= max_radius):
+                if max_radius is not None:
+                    found = [pair for pair in found if pair[1] <= max_radius]
+                return heapq.nsmallest(count, found, key=lambda pair: pair[1])
+            radius *= 2
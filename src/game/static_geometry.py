@@ -0,0 +1,175 @@
+import math
+
+from panda3d.core import Point3, Vec3, VBase4
+from systems.log import get_logger
+
+log = get_logger("level")
+
+# Most platform nodes flattened in one build step; bigger groups are split into chunks
+NODES_PER_STEP = 64
+
+def height_band(z, band_height):
+    """Get the index of the height band containing z (0 when levels aren't banded)"""
+    if not band_height:
+        return 0
+    return int(math.floor(z / band_height))
+
+class PlatformHandle:
+    """Lightweight stand-in for a platform NodePath once the level is batched"""
+    __slots__ = ('id', 'type', 'pos', 'scale', 'color', 'model', 'band')
+    
+    def __init__(self, platform_id, platform_type, pos, scale, color, model, band=0):
+        self.id = platform_id
+        self.type = platform_type
+        self.pos = Point3(*pos)
+        self.scale = Vec3(*scale)
+        self.color = VBase4(*color)
+        self.model = model  # Per-platform node, only valid until build()
+        self.band = band
+    
+    def getPos(self):
+        """Get platform position (mirrors NodePath.getPos)"""
+        return Point3(self.pos)
+    
+    def getScale(self):
+        """Get platform scale (mirrors NodePath.getScale)"""
+        return Vec3(self.scale)
+    
+    def getColor(self):
+        """Get platform colour (mirrors NodePath.getColor)"""
+        return VBase4(self.color)
+
+
+class StaticGeometry:
+    """Batches static level geometry into a few flattened nodes grouped by colour
+    
+    With a band_height, platforms are first split into horizontal height
+    bands (nodes named band_<index>) so each band can be shown or hidden
+    on its own.
+    """
+    
+    def __init__(self, base, name="static_geometry", parent=None, band_height=None):
+        self.base = base
+        self.root = (parent if parent is not None else self.base.render).attachNewNode(name)
+        self.band_height = band_height
+        
+        self.bands = {}  # Band index -> band NodePath
+        self.groups = {}  # (band, colour tuple) -> group NodePath
+        self.handles = {}  # Platform ID -> PlatformHandle
+        self.anonymous = []  # Handles for platforms without an ID
+        self.is_built = False
+        
+        # Share the cached box model and copy it for every platform
+        self.box_template = self.base.asset_cache.acquire("models/box")
+    
+    def add_box(self, position, scale, color, platform_id=None, platform_type=None):
+        """Add an axis-aligned box to the batch and return its handle"""
+        color = tuple(color)
+        band = height_band(position[2], self.band_height)
+        group = self.groups.get((band, color))
+        if group is None:
+            # Colour lives on the group so every child shares one render state
+            group = self.get_band(band).attachNewNode(f"static_group_{len(self.groups)}")
+            group.setColor(*color)
+            self.groups[(band, color)] = group
+        
+        model = self.box_template.copyTo(group)
+        model.setPos(*position)
+        model.setScale(*scale)
+        
+        handle = PlatformHandle(platform_id, platform_type, position, scale, color, model, band)
+        if platform_id is not None:
+            self.handles[platform_id] = handle
+        else:
+            self.anonymous.append(handle)
+        return handle
+    
+    def add_handle(self, position, scale, color, platform_id=None, platform_type=None):
+        """Register a platform whose geometry is already in a prebuilt batch"""
+        band = height_band(position[2], self.band_height)
+        handle = PlatformHandle(platform_id, platform_type, position, scale, tuple(color), None, band)
+        if platform_id is not None:
+            self.handles[platform_id] = handle
+        else:
+            self.anonymous.append(handle)
+        return handle
+    
+    def attach_prebuilt(self, model):
+        """Use an already flattened batch (e.g. loaded from a compiled level)"""
+        model.reparentTo(self.root)
+        for band_np in model.findAllMatches("**/band_*"):
+            self.bands[int(band_np.getName()[len("band_"):])] = band_np
+        self.is_built = True
+    
+    def get_band(self, band):
+        """Get the node holding one height band, creating it if needed"""
+        band_np = self.bands.get(band)
+        if band_np is None:
+            band_np = self.root.attachNewNode(f"band_{band}")
+            self.bands[band] = band_np
+        return band_np
+    
+    def set_band_visible(self, band, visible):
+        """Show or stash (hide and skip culling) one height band"""
+        band_np = self.bands.get(band)
+        if band_np is None:
+            return
+        if visible:
+            band_np.unstash()
+        else:
+            band_np.stash()
+    
+    def get(self, platform_id):
+        """Get a platform handle by ID"""
+        return self.handles.get(platform_id)
+    
+    def build(self):
+        """Flatten every colour group into a single batched node"""
+        for _ in self.build_steps():
+            pass
+    
+    def build_steps(self):
+        """build() at most NODES_PER_STEP platforms per step, yielding the fraction flattened
+        
+        Small groups flatten whole; larger ones become one flattened chunk
+        node per NODES_PER_STEP platforms so no single step stalls a frame.
+        """
+        steps = []  # (group, platform nodes or None for the whole group)
+        for group in self.groups.values():
+            children = list(group.getChildren())
+            if len(children) <= NODES_PER_STEP:
+                steps.append((group, None))
+                continue
+            for start in range(0, len(children), NODES_PER_STEP):
+                steps.append((group, children[start:start + NODES_PER_STEP]))
+        
+        for i, (group, nodes) in enumerate(steps):
+            if nodes is None:
+                group.flattenStrong()
+            else:
+                chunk = group.attachNewNode("static_chunk")
+                for node in nodes:
+                    node.reparentTo(chunk)
+                chunk.flattenStrong()
+            yield (i + 1) / len(steps)
+        
+        # The per-platform nodes were merged away by the flatten
+        for handle in self.handles.values():
+            handle.model = None
+        for handle in self.anonymous:
+            handle.model = None
+        
+        self.is_built = True
+        log.debug("Static geometry: %d platforms batched into %d groups",
+                  len(self.handles) + len(self.anonymous), len(self.groups))
+    
+    def cleanup(self):
+        """Remove all batched geometry"""
+        self.root.removeNode()
+        self.bands.clear()
+        if self.box_template is not None:
+            self.base.asset_cache.release_template("models/box")
+            self.box_template = None
+        self.groups.clear()
+        self.handles.clear()
+        self.anonymous.clear()
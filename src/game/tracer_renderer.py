@@ -0,0 +1,184 @@
+import struct
+
+from direct.showbase.ShowBaseGlobal import globalClock
+from panda3d.core import (
+    Geom, GeomNode, GeomTriangles, GeomVertexData, GeomVertexFormat, GeomVertexWriter,
+    OmniBoundingVolume, Shader, Texture, SamplerState, ColorBlendAttrib, TransparencyAttrib
+)
+
+TRACER_VERTEX_SHADER = """
+#version 150
+
+uniform mat4 p3d_ModelViewMatrix;
+uniform mat4 p3d_ProjectionMatrix;
+uniform float osg_FrameTime;
+uniform sampler2D tracer_data;
+uniform float tracer_length;
+uniform float tracer_width;
+
+in vec4 p3d_Vertex;
+
+out vec4 v_color;
+out float v_edge;
+
+void main() {
+    // Row 0: start.xyz + birth time, row 1: end.xyz + duration, row 2: colour
+    vec4 start = texelFetch(tracer_data, ivec2(gl_InstanceID, 0), 0);
+    vec4 end = texelFetch(tracer_data, ivec2(gl_InstanceID, 1), 0);
+    vec4 color = texelFetch(tracer_data, ivec2(gl_InstanceID, 2), 0);
+
+    float t = (osg_FrameTime - start.w) / max(end.w, 1e-4);
+    if (end.w <= 0.0 || t < 0.0 || t >= 1.0) {
+        // Dead slot: collapse outside the clip volume
+        gl_Position = vec4(2.0, 2.0, 2.0, 1.0);
+        v_color = vec4(0.0);
+        v_edge = 1.0;
+        return;
+    }
+
+    // Head travels from start to end, the tail trails behind it
+    vec3 path = end.xyz - start.xyz;
+    float path_len = max(length(path), 1e-4);
+    vec3 head_world = start.xyz + path * t;
+    vec3 tail_world = head_world - path / path_len * min(tracer_length, path_len * t);
+
+    // Billboard the segment around its own axis in view space
+    vec3 head = (p3d_ModelViewMatrix * vec4(head_world, 1.0)).xyz;
+    vec3 tail = (p3d_ModelViewMatrix * vec4(tail_world, 1.0)).xyz;
+    vec3 side = cross(head - tail, head);
+    side = dot(side, side) > 1e-8 ? normalize(side) : vec3(1.0, 0.0, 0.0);
+
+    vec3 pos = mix(tail, head, p3d_Vertex.y) + side * (p3d_Vertex.x * tracer_width);
+    gl_Position = p3d_ProjectionMatrix * vec4(pos, 1.0);
+    v_color = vec4(color.rgb, color.a * (1.0 - t));
+    v_edge = abs(p3d_Vertex.x);
+}
+"""
+
+TRACER_FRAGMENT_SHADER = """
+#version 150
+
+in vec4 v_color;
+in float v_edge;
+
+out vec4 p3d_FragColor;
+
+void main() {
+    // Bright core fading out towards the edges for the glow
+    p3d_FragColor = vec4(v_color.rgb, v_color.a * (1.0 - v_edge * v_edge));
+}
+"""
+
+# Colours for player (blue) and enemy (red) tracers
+TRACER_COLORS = {
+    True: (0.4, 0.6, 1, 1.0),
+    False: (1, 0.4, 0.4, 1.0),
+}
+
+class TracerRenderer:
+    """Draws every active bullet tracer with one instanced draw call
+    
+    Tracer state (start, end, colour, birth time) lives in a small float
+    texture; a shader billboards and fades each instance, so nothing is
+    updated per frame except uploading newly spawned tracers.
+    """
+    TRACER_TIME = 0.3  # Seconds for a tracer to reach its end point
+    TRACER_LENGTH = 2.4
+    TRACER_WIDTH = 0.3
+    ROWS = 3
+    TEXEL_SIZE = 16  # Four float32 components
+    
+    def __init__(self, base, capacity=256):
+        self.base = base
+        self.capacity = capacity
+        self.next_slot = 0  # Ring cursor, always points at the oldest slot
+        self.dirty = False
+        
+        # CPU copy of the data texture, uploaded when tracers are spawned
+        self.data = bytearray(capacity * self.ROWS * self.TEXEL_SIZE)
+        self.texture = Texture("tracer_data")
+        self.texture.setup2dTexture(capacity, self.ROWS, Texture.T_float, Texture.F_rgba32)
+        self.texture.setMinfilter(SamplerState.FT_nearest)
+        self.texture.setMagfilter(SamplerState.FT_nearest)
+        self.upload()
+        
+        self.node = self.base.render.attachNewNode(self._make_quad())
+        self.node.setInstanceCount(capacity)
+        # Instances are placed by the shader, so the quad's own bounds mean nothing
+        self.node.node().setBounds(OmniBoundingVolume())
+        self.node.node().setFinal(True)
+        self.node.setShader(Shader.make(Shader.SL_GLSL, TRACER_VERTEX_SHADER, TRACER_FRAGMENT_SHADER))
+        self.node.setShaderInput("tracer_data", self.texture)
+        self.node.setShaderInput("tracer_length", self.TRACER_LENGTH)
+        self.node.setShaderInput("tracer_width", self.TRACER_WIDTH)
+        self.node.setAttrib(ColorBlendAttrib.make(ColorBlendAttrib.MAdd))  # Additive blending for glow
+        self.node.setTransparency(TransparencyAttrib.MAlpha)
+        self.node.setDepthWrite(False)
+        self.node.setTwoSided(True)
+        self.node.setLightOff()
+        self.node.setBin("fixed", 0)
+    
+    @staticmethod
+    def is_supported(base):
+        """Check whether the window's GSG can run the instanced tracer shader"""
+        win = getattr(base, 'win', None)
+        gsg = win.getGsg() if win else None
+        if gsg is None:
+            return False
+        return gsg.getSupportsGlsl() and gsg.getSupportsGeometryInstancing()
+    
+    def _make_quad(self):
+        """Build the unit quad every tracer instance is drawn from
+        
+        x runs across the tracer (-1..1), y runs from tail (0) to head (1).
+        """
+        vdata = GeomVertexData("tracer", GeomVertexFormat.getV3(), Geom.UHStatic)
+        vdata.setNumRows(4)
+        writer = GeomVertexWriter(vdata, "vertex")
+        for x, y in ((-1, 0), (1, 0), (1, 1), (-1, 1)):
+            writer.addData3(x, y, 0)
+        
+        triangles = GeomTriangles(Geom.UHStatic)
+        triangles.addVertices(0, 1, 2)
+        triangles.addVertices(0, 2, 3)
+        
+        geom = Geom(vdata)
+        geom.addPrimitive(triangles)
+        node = GeomNode("tracers")
+        node.addGeom(geom)
+        return node
+    
+    def _write(self, slot, row, a, b, c, d):
+        """Write one RGBA float texel"""
+        offset = (row * self.capacity + slot) * self.TEXEL_SIZE
+        struct.pack_into("<4f", self.data, offset, a, b, c, d)
+    
+    def spawn_trail(self, start_pos, end_pos, is_player=True):
+        """Start a tracer travelling from start_pos to end_pos"""
+        slot = self.next_slot
+        self.next_slot = (slot + 1) % self.capacity
+        
+        now = globalClock.getFrameTime()
+        self._write(slot, 0, start_pos[0], start_pos[1], start_pos[2], now)
+        self._write(slot, 1, end_pos[0], end_pos[1], end_pos[2], self.TRACER_TIME)
+        self._write(slot, 2, *TRACER_COLORS[is_player])
+        self.dirty = True
+    
+    def upload(self):
+        """Copy the CPU tracer data to the texture"""
+        self.texture.setRamImageAs(bytes(self.data), "RGBA")
+        self.dirty = False
+    
+    def update(self, dt):
+        """Upload tracers spawned this frame (fading is done on the GPU)"""
+        if self.dirty:
+            self.upload()
+    
+    def clear(self):
+        """Kill every live tracer"""
+        self.data[:] = bytes(len(self.data))
+        self.upload()
+    
+    def cleanup(self):
+        """Remove the tracer node"""
+        self.node.removeNode()
@@ -0,0 +1,81 @@
+from direct.showbase.MessengerGlobal import messenger
+from panda3d.bullet import BulletBoxShape, BulletGhostNode
+from panda3d.core import NodePath, Point3, Vec3
+
+class TriggerVolume:
+    """A ghost box that reports what enters and leaves it"""
+    __slots__ = ('kind', 'data', 'np', 'occupants')
+    
+    def __init__(self, kind, data, np):
+        self.kind = kind
+        self.data = data  # Whatever the owner needs, e.g. a checkpoint ID
+        self.np = np
+        self.occupants = set()  # NodePaths of overlapping bodies as of last frame
+    
+    def getPos(self):
+        """Get the volume's centre (mirrors NodePath.getPos)"""
+        return self.np.getPos()
+
+class TriggerSystem:
+    """Trigger volumes built on Bullet ghost nodes
+    
+    Bullet keeps each ghost's overlapping objects up to date from its
+    broadphase, so a frame where nothing overlaps any trigger costs one
+    count check per volume. When something enters or leaves a volume the
+    events '<kind>-enter' and '<kind>-exit' are sent with arguments
+    (volume, owner), where owner is the node's 'owner' python tag (e.g. the
+    Player). Only bodies whose collide mask includes MASK_TRIGGER overlap.
+    """
+    
+    def __init__(self, base, collision_system):
+        self.base = base
+        self.collision_system = collision_system
+        self.volumes = []
+        
+        # After the physics step so overlaps reflect this frame's tick
+        self.base.taskMgr.add(self.update, "trigger_update", sort=1)
+    
+    def add_box(self, kind, center, half_extents, data=None):
+        """Add an axis-aligned trigger box"""
+        ghost = BulletGhostNode(f"trigger_{kind}")
+        ghost.addShape(BulletBoxShape(Vec3(*half_extents)))
+        np = self.base.render.attachNewNode(ghost)
+        np.setPos(Point3(*center))
+        np.setCollideMask(self.collision_system.MASK_TRIGGER)
+        self.collision_system.world.attachGhost(ghost)
+        
+        volume = TriggerVolume(kind, data, np)
+        self.volumes.append(volume)
+        return volume
+    
+    def update(self, task):
+        """Send enter/exit events for volumes whose occupants changed"""
+        for volume in self.volumes:
+            ghost = volume.np.node()
+            if ghost.getNumOverlappingNodes() == 0 and not volume.occupants:
+                continue
+            
+            current = {NodePath(node) for node in ghost.getOverlappingNodes()}
+            if current == volume.occupants:
+                continue
+            entered = current - volume.occupants
+            exited = volume.occupants - current
+            volume.occupants = current
+            
+            for np in exited:
+                messenger.send(f"{volume.kind}-exit", [volume, np.getPythonTag('owner')])
+            for np in entered:
+                messenger.send(f"{volume.kind}-enter", [volume, np.getPythonTag('owner')])
+        return task.cont
+    
+    def remove(self, volume):
+        """Remove one trigger volume"""
+        self.collision_system.world.removeGhost(volume.np.node())
+        volume.np.removeNode()
+        self.volumes.remove(volume)
+    
+    def cleanup(self):
+        """Remove every volume and stop checking"""
+        self.base.taskMgr.remove("trigger_update")
+        for volume in list(self.volumes):
+            self.remove(volume)
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""Run a level without a window, stepping the simulation as fast as possible
+
+Usage: python src/headless.py --level 2 --seconds 60
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add src directory to Python path
+src_dir = os.path.dirname(os.path.abspath(__file__))
+if src_dir not in sys.path:
+    sys.path.append(src_dir)
+
+from panda3d.core import loadPrcFileData
+
+# No window, no audio device; everything else matches the game's config
+loadPrcFileData("", """
+    window-type none
+    audio-library-name null
+    bullet-enable-contact-events #t
+    model-path $MAIN_DIR/assets
+""".replace("$MAIN_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from direct.showbase.ShowBase import ShowBase
+from direct.showbase.ShowBaseGlobal import globalClock
+from panda3d.core import ClockObject
+
+from game.collision import CollisionSystem
+from game.combat_system import CombatSystem
+from game.player import Player
+from game.level import Level
+from ui.hud import HUD
+from systems.settings import Settings
+from systems.scripted_input import ScriptedInput
+from systems.input_recorder import InputRecorder, InputReplay
+from systems.profiler import TaskProfiler
+from systems.log import configure_logging
+from systems.asset_cache import AssetCache
+
+class HeadlessJump(ShowBase):
+    """Windowless game instance that simulates one level from scripted input"""
+    
+    def __init__(self, tick_rate=None, script=None, load_arena=True, recorder=None, with_hud=False, profile=False):
+        ShowBase.__init__(self, windowType='none')
+        
+        # Set base attribute for compatibility
+        self.base = self
+        
+        # No window means no default camera; the player rig still needs one
+        if self.camera is None:
+            self.camera = self.render.attachNewNode("camera")
+        
+        self.settings = Settings()
+        log_levels = self.settings.get_log_levels()
+        configure_logging(log_levels, default_level=log_levels.pop("default"))
+        self.tick_rate = tick_rate or self.settings.get_physics_tick_rate()
+        self.load_arena = load_arena
+        self.with_hud = with_hud
+        self.input = script or ScriptedInput()
+        self.input_recorder = recorder
+        
+        # Optionally time every task the game adds
+        self.profiler = None
+        if profile:
+            self.profiler = TaskProfiler(self)
+            self.profiler.install()
+        
+        # Every frame advances the clock by exactly one physics tick, so the
+        # simulation is decoupled from wall time and runs flat out
+        globalClock.setMode(ClockObject.MNonRealTime)
+        globalClock.setFrameRate(self.tick_rate)
+        
+        # Game systems; tracers fall back to the pooled backend without a GSG
+        self.asset_cache = AssetCache(self.loader)
+        self.collision_system = CollisionSystem(self, tick_rate=self.tick_rate, max_catchup_steps=1)
+        self.combat_system = CombatSystem(self, tracer_backend="pooled")
+        
+        self.level = None
+        self.player = None
+        self.arena = None
+        self.arena_collision = None
+        self.tick = 0
+        self.victory = False
+        self.game_over = False
+        
+        self.accept('game_over', self.on_game_over)
+        self.accept('level_complete', self.on_level_complete)
+    
+    def load(self, level, seed=None):
+        """Load a level and spawn the player, returning False on failure
+        
+        level is a level number or already-parsed level data.
+        """
+        if self.load_arena:
+            try:
+                self.arena = self.loader.loadModel("../assets/models/arena_1.bam")
+                self.arena.reparentTo(self.render)
+                self.arena_collision = self.collision_system.make_collision_from_model(self.arena, mass=0)
+            except Exception as e:
+                print(f"Arena not loaded: {e}")
+                self.arena = None
+        
+        self.level = Level(self, seed=seed)
+        if isinstance(level, dict):
+            loaded = self.level.load_level_data(level)
+        else:
+            loaded = self.level.load_level(level)
+        if not loaded:
+            return False
+        
+        self.player = Player(self, self.collision_system, self.combat_system)
+        self.player.set_checkpoint(self.level.spawn_point)
+        self.player.physics_node.setPos(self.level.spawn_point)
+        self.player.interpolation.snap()
+        
+        # Replays also drive the mouse; recorders capture every frame
+        if hasattr(self.input, 'get_mouse'):
+            self.player.input_source = self.input
+        self.player.input_recorder = self.input_recorder
+        
+        # The HUD is optional since it only matters when timing its task
+        if self.with_hud:
+            self.hud = HUD(self)
+            self.hud.start_stopwatch()
+        return True
+    
+    def on_game_over(self):
+        """Stop the run when the player is out of lives"""
+        self.game_over = True
+    
+    def on_level_complete(self, level):
+        """Stop the run when the player reaches the victory pad"""
+        self.victory = True
+    
+    def step(self):
+        """Feed one tick of input and run one frame of every task"""
+        self.input.apply(self.player, self.tick)
+        
+        # Replays reproduce the recorded frame times exactly
+        dt = self.input.dt_at(self.tick) if hasattr(self.input, 'dt_at') else None
+        if dt is not None:
+            globalClock.setDt(dt)
+        self.taskMgr.step()
+        self.tick += 1
+    
+    def run_ticks(self, ticks):
+        """Simulate up to ticks frames and return a summary of the run"""
+        start = time.perf_counter()
+        while self.tick < ticks and not (self.victory or self.game_over):
+            self.step()
+        wall_time = time.perf_counter() - start
+        
+        sim_time = self.tick / self.tick_rate
+        pos = self.player.physics_node.getPos()
+        return {
+            "ticks": self.tick,
+            "sim_seconds": sim_time,
+            "wall_seconds": wall_time,
+            "speedup": sim_time / wall_time if wall_time > 0 else 0.0,
+            "player_pos": [pos.getX(), pos.getY(), pos.getZ()],
+            "health": self.player.health,
+            "lives": self.player.lives,
+            "enemies_alive": len(self.level.enemy_manager),
+            "victory": self.victory,
+            "game_over": self.game_over,
+        }
+    
+    def unload(self):
+        """Tear down the current level so another can be loaded"""
+        if hasattr(self, 'hud'):
+            self.hud.cleanup()
+            del self.hud
+        if self.player:
+            self.input.release_all(self.player)
+            self.player.cleanup()
+            self.player = None
+        if self.level:
+            self.level.cleanup()
+            self.level = None
+        if self.arena:
+            self.arena.removeNode()
+            self.arena = None
+        if self.arena_collision:
+            self.collision_system.world.removeRigidBody(self.arena_collision.node())
+            self.arena_collision.removeNode()
+            self.arena_collision = None
+        self.asset_cache.evict_unused()
+        
+        self.tick = 0
+        self.victory = False
+        self.game_over = False
+    
+    def cleanup(self):
+        """Tear down the level and every system"""
+        self.unload()
+        self.combat_system.cleanup()
+        self.collision_system.cleanup()
+        if self.profiler:
+            self.profiler.cleanup()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a Jump! level without a window")
+    parser.add_argument("--level", type=int, default=1, help="Level number to load")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Simulated seconds to run")
+    parser.add_argument("--tick-rate", type=int, default=None, help="Simulation ticks per second")
+    parser.add_argument("--script", default=None, help="JSON input script (defaults to a built-in route)")
+    parser.add_argument("--no-arena", action="store_true", help="Skip loading the arena model")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for enemy behaviour")
+    parser.add_argument("--record", default=None, help="Save the run's input to this file")
+    parser.add_argument("--replay", default=None, help="Replay a recorded input file (sets level and seed)")
+    parser.add_argument("--profile", action="store_true", help="Time every task and print a report")
+    parser.add_argument("--trace", default=None, help="Save a Chrome trace-event JSON of every task run (implies --profile)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    level_num, seed = args.level, args.seed
+    if args.replay:
+        script = InputReplay.load(args.replay)
+        level_num, seed = script.level_number, script.seed
+    elif args.script:
+        script = ScriptedInput.from_file(args.script)
+    else:
+        script = None
+    recorder = InputRecorder(seed, level_num) if args.record else None
+    
+    app = HeadlessJump(tick_rate=args.tick_rate, script=script, load_arena=not args.no_arena,
+                       recorder=recorder, profile=args.profile or bool(args.trace))
+    if args.trace:
+        app.profiler.start_capture()
+    if not app.load(level_num, seed=seed):
+        print("Failed to load level!")
+        return 1
+    
+    ticks = len(script) if args.replay else int(args.seconds * app.tick_rate)
+    summary = app.run_ticks(ticks)
+    if args.trace:
+        app.profiler.stop_capture(args.trace)
+    if app.profiler:
+        print(app.profiler.report())
+    app.cleanup()
+    if recorder:
+        recorder.save(args.record)
+    
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
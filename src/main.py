@@ -2,6 +2,8 @@
 
 import os
 import sys
+import time
+import random
 
 # Add src directory to Python path
 src_dir = os.path.dirname(os.path.abspath(__file__))
@@ -19,20 +21,25 @@ loadPrcFileData("", """
     win-size 1280 720
     framebuffer-multisample 1
     multisamples 2
-    show-frame-rate-meter 1
     sync-video 1
     bullet-enable-contact-events #t
     model-path $MAIN_DIR/assets
 """.replace("$MAIN_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from game.game_manager import GameManager
 from game.collision import CollisionSystem
 from game.combat_system import CombatSystem
 from game.player import Player
 from systems.settings import Settings
 from systems.input_manager import InputManager
 from systems.audio_manager import AudioManager
+from systems.debug_overlay import DebugOverlay
+from systems.input_recorder import InputRecorder
+from systems.profiler import TaskProfiler
+from systems.log import configure_logging, get_logger
+from systems.asset_cache import AssetCache
+from systems.time_slicer import TimeSlicedJob
 from game.level import Level
+from game.level_loader import LevelLoader
 
 # Import UI components
 from ui.main_menu import MainMenu
@@ -42,6 +49,23 @@ from ui.leaderboard_menu import LeaderboardMenu
 from ui.pause_menu import PauseMenu
 from ui.hud import HUD
 from ui.name_input import NameInput
+from ui.loading_screen import LoadingScreen
+
+ARENA_PATH = "../assets/models/arena_1.bam"
+
+log = get_logger("game")
+
+# Tasks that advance the game world; pausing takes these off the task manager
+SIMULATION_TASKS = [
+    "physics_update",
+    "player_update",
+    "enemy_manager_update",
+    "gun_combat_update",
+    "trigger_update",
+    "level_streamer_update",
+    "level_reset",
+    "stopwatch_task",
+]
 
 class Jump(ShowBase, FSM):
     def __init__(self):
@@ -56,27 +80,56 @@ class Jump(ShowBase, FSM):
         
         # Initialize game systems
         self.settings = Settings()
+        log_levels = self.settings.get_log_levels()
+        configure_logging(log_levels, default_level=log_levels.pop("default"))
         self.input_manager = InputManager()
         self.audio_manager = AudioManager(self)
         
+        # Time every task added from here on
+        self.profiler = None
+        if self.settings.get_setting("debug", "task_profiler"):
+            self.profiler = TaskProfiler(self)
+            self.profiler.install()
+        
+        # Models shared by every level, player and enemy
+        self.asset_cache = AssetCache(self.loader)
+        
         # Create collision system
-        self.collision_system = CollisionSystem(self)
+        self.collision_system = CollisionSystem(
+            self,
+            tick_rate=self.settings.get_physics_tick_rate(),
+            max_catchup_steps=self.settings.get_max_catchup_steps()
+        )
+        
+        # Debug visualization toggles (off by default)
+        self.debug_overlay = DebugOverlay(self, self.settings)
         
         # Create combat system
-        self.combat_system = CombatSystem(self)
+        self.combat_system = CombatSystem(self, tracer_backend=self.settings.get_tracer_renderer())
         
         # Initialize UI containers
         self.current_menu = None
         self.hud = None
+        self.level = None
+        self.level_loader = None
+        self.reset_job = None
+        self.arena = None
+        self.arena_collision = None
+        self.suspended_tasks = []  # Simulation tasks held while paused
         
         # Player data
         self.player_name = None
+        self.input_recorder = None
         
         # Start with main menu
         self.request('MainMenu')
         
         # Bind the escape key to pause/unpause
         self.accept("escape", self.toggle_pause)
+        
+        # Progress events sent by the level's trigger volumes
+        self.accept('level_complete', self.on_level_complete)
+        self.accept('checkpoint_reached', self.on_checkpoint_reached)
     
     def enterMainMenu(self):
         """Enter main menu state"""
@@ -153,21 +206,58 @@ class Jump(ShowBase, FSM):
         props.setMouseMode(WindowProperties.M_relative)
         self.win.requestProperties(props)
         
-        # Load the arena model
-        self.arena = self.loader.loadModel("../assets/models/arena_1.bam")
-        self.arena.reparentTo(self.render)
-        self.arena.setPos(0, 0, 0)
+        # Resuming from the pause menu keeps the loaded level
+        if self.oldState == 'Paused':
+            return
         
-        # Create collision mesh for the arena
-        self.collision_system.make_collision_from_model(self.arena, mass=0)
+        self.start_game_level()
+    
+    def exitGame(self):
+        """Exit gameplay state"""
+        # Pausing keeps the level resident so resume and restart are instant
+        if self.newState == 'Paused':
+            return
         
-        # Create level
-        self.level = Level(self)
-        if not self.level.load_level(self.current_level_num):
+        self.unload_game_level()
+    
+    def enterLoading(self):
+        """Load current_level_num in the background behind a loading screen"""
+        # Create level, seeding enemy behaviour per run so it can be replayed
+        self.run_seed = random.randrange(1 << 32)
+        self.level = Level(self, seed=self.run_seed)
+        
+        self.level_loader = LevelLoader(
+            self, self.level, self.current_level_num,
+            arena_path=ARENA_PATH,
+            budget_ms=self.settings.get_build_budget_ms()
+        )
+        self.current_menu = LoadingScreen(self, self.level_loader, title=f"Loading Level {self.current_level_num}")
+        self.level_loader.start(self.on_level_loaded)
+    
+    def on_level_loaded(self, success):
+        """Enter the game once the loader has attached the level"""
+        if not success:
             print("Failed to load level!")
-            self.taskMgr.doMethodLater(0.1, lambda task: self.request('MainMenu'), 'delayed_menu_transition')
+            self.request('MainMenu')
             return
+        self.request('Game')
+    
+    def exitLoading(self):
+        """Exit loading state"""
+        if self.current_menu:
+            self.current_menu.cleanup()
+            self.current_menu = None
+        
+        if self.level_loader:
+            self.level_loader.cancel()
+            self.level_loader = None
         
+        # Abandoned or failed loads leave nothing behind
+        if self.newState != 'Game':
+            self.unload_game_level()
+    
+    def start_game_level(self):
+        """Create the player and HUD in the freshly loaded level"""
         # Create player at level's spawn point
         self.player = Player(self, self.collision_system, self.combat_system)
         self.player.physics_node.setPos(self.level.spawn_point)
@@ -175,11 +265,22 @@ class Jump(ShowBase, FSM):
         # Create HUD
         self.hud = HUD(self)
         
+        # Record this run's input for replay if enabled
+        if self.settings.get_setting("debug", "record_input"):
+            self.input_recorder = InputRecorder(self.run_seed, self.current_level_num)
+            self.player.input_recorder = self.input_recorder
+        
         # Enable mouse control for gameplay
         self.player.enable_mouse_control()
     
-    def exitGame(self):
-        """Exit gameplay state"""
+    def unload_game_level(self):
+        """Tear down the level, arena, player and HUD"""
+        self.save_recording()
+        
+        if self.reset_job:
+            self.reset_job.cancel()
+            self.reset_job = None
+        
         if hasattr(self, 'player'):
             self.player.cleanup()
             del self.player
@@ -188,12 +289,68 @@ class Jump(ShowBase, FSM):
             self.hud.cleanup()
             self.hud = None
         
-        if hasattr(self, 'arena'):
+        if self.level:
+            self.level.cleanup()
+            self.level = None
+        
+        if self.arena_collision:
+            self.collision_system.world.removeRigidBody(self.arena_collision.node())
+            self.arena_collision.removeNode()
+            self.arena_collision = None
+        
+        if self.arena:
             self.arena.removeNode()
-            del self.arena
+            self.arena = None
+        
+        # Drop models only the old level used
+        self.asset_cache.evict_unused()
+    
+    def save_recording(self):
+        """Save and stop the current input recording, if any"""
+        if self.input_recorder:
+            os.makedirs("recordings", exist_ok=True)
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            self.input_recorder.save(os.path.join("recordings", f"level_{self.current_level_num}_{timestamp}.jrec"))
+            self.input_recorder = None
+    
+    def restart_level(self):
+        """Restart the current level in place
+        
+        Static geometry and colliders stay loaded; only the player, enemies,
+        checkpoint and timers go back to their starting state.
+        """
+        if not (self.level and hasattr(self, 'player')):
+            self.request('Loading')
+            return
+        
+        if self.state == 'Paused':
+            self.request('Game')
+        
+        # Each attempt is its own recording with its own seed
+        self.save_recording()
+        self.run_seed = random.randrange(1 << 32)
+        self.level.enemy_manager.seed = self.run_seed
+        
+        # Respawn enemies over a few frames, within the per-frame build budget
+        if self.reset_job:
+            self.reset_job.cancel()
+        self.reset_job = TimeSlicedJob(
+            self, self.level.reset_steps(), "level_reset",
+            budget_ms=self.settings.get_build_budget_ms()
+        ).start()
+        self.player.reset(self.level.spawn_point)
+        self.collision_system.accumulator = 0.0
+        
+        if self.hud and self.hud.stopwatch_running:
+            self.hud.start_stopwatch()
+        
+        if self.settings.get_setting("debug", "record_input"):
+            self.input_recorder = InputRecorder(self.run_seed, self.current_level_num)
+        self.player.input_recorder = self.input_recorder
     
     def enterPaused(self):
         """Enter paused state"""
+        self.suspend_simulation()
         if hasattr(self, 'player'):
             self.player.disable_mouse_control()
         
@@ -211,9 +368,60 @@ class Jump(ShowBase, FSM):
             self.current_menu.cleanup()
             self.current_menu = None
         
+        # Put the tasks back first; systems that outlive the level own some of them
+        self.resume_simulation()
+        
+        # Leaving the pause menu for anything but the game ends the run
+        if self.newState != 'Game':
+            self.unload_game_level()
+            return
+        
         if hasattr(self, 'player'):
             self.player.enable_mouse_control()
     
+    def suspend_simulation(self):
+        """Stop the game world: take its tasks off, let go of keys and freeze the stopwatch"""
+        for name in SIMULATION_TASKS:
+            for task in self.taskMgr.getTasksNamed(name):
+                self.taskMgr.remove(task)
+                self.suspended_tasks.append(task)
+        
+        if hasattr(self, 'player'):
+            self.player.release_keys()
+        if self.hud:
+            self.hud.pause_stopwatch()
+    
+    def resume_simulation(self):
+        """Put back the tasks taken off by suspend_simulation and restart the stopwatch"""
+        for task in self.suspended_tasks:
+            self.taskMgr.add(task)
+        self.suspended_tasks = []
+        
+        if self.hud:
+            self.hud.resume_stopwatch()
+    
+    def on_level_complete(self, level):
+        """Stop the clock and head back to level select once the victory pad is reached"""
+        if self.state != 'Game' or level is not self.level:
+            return
+        
+        if self.hud:
+            self.hud.stop_stopwatch()
+            log.info("Level %s complete in %.2f seconds", self.current_level_num, self.hud.get_elapsed_time())
+        
+        # Sent from inside the trigger update, so leave the level on the next frame
+        self.taskMgr.doMethodLater(0, self.finish_level, "finish_level_task")
+    
+    def finish_level(self, task):
+        """Leave a completed level for level select"""
+        if self.state == 'Game':
+            self.request('LevelSelect')
+        return task.done
+    
+    def on_checkpoint_reached(self, checkpoint_id):
+        """Note checkpoint progress; the level has already moved the respawn point"""
+        log.info("Checkpoint %s reached", checkpoint_id)
+    
     def toggle_pause(self):
         """Toggle pause state"""
         if self.state == 'Game':
@@ -228,7 +436,7 @@ class Jump(ShowBase, FSM):
     def start_level(self, level_num):
         """Start a specific level"""
         self.current_level_num = level_num
-        self.request('Game')
+        self.request('Loading')
     
     def quit_to_menu(self):
         """Quit current game and return to main menu"""
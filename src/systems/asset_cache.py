@@ -0,0 +1,81 @@
+import threading
+
+from panda3d.core import NodePath
+
+class AssetCache:
+    """Loads each model once and hands out instances of it
+    
+    instance() returns a holder node with the shared model instanced
+    beneath it, so transforms and colour set on the holder stay per
+    instance while the geometry is stored once. Callers that modify the
+    geometry itself (e.g. flattening) acquire() the template and copy it.
+    Models are reference counted; evict_unused() drops the ones nothing
+    holds any more, typically between levels. Safe to call from the level
+    loading thread.
+    """
+    
+    def __init__(self, loader):
+        self.loader = loader
+        self.models = {}  # Model path -> template NodePath
+        self.refs = {}  # Model path -> live instances and acquired templates
+        self.holders = {}  # Holder node -> model path
+        self.lock = threading.RLock()  # Level compiles acquire templates off the main thread
+    
+    def get(self, path):
+        """Get the shared template for a model, loading it on first use"""
+        with self.lock:
+            model = self.models.get(path)
+            if model is None:
+                model = self.loader.loadModel(path)
+                self.models[path] = model
+                self.refs[path] = 0
+            return model
+    
+    def instance(self, path, parent=None, name=None):
+        """Get a new holder node instancing the shared model"""
+        with self.lock:
+            model = self.get(path)
+            holder = NodePath(name or f"{path}_instance")
+            model.instanceTo(holder)
+            self.refs[path] += 1
+            self.holders[holder.node()] = path
+        if parent is not None:
+            holder.reparentTo(parent)
+        return holder
+    
+    def acquire(self, path):
+        """Hold a reference to the template itself (e.g. to copy it repeatedly)"""
+        with self.lock:
+            model = self.get(path)
+            self.refs[path] += 1
+            return model
+    
+    def release(self, node):
+        """Remove an instance from the scene and drop its reference"""
+        if node.isEmpty():
+            return
+        with self.lock:
+            path = self.holders.pop(node.node(), None)
+            if path is not None:
+                self.refs[path] -= 1
+        node.removeNode()
+    
+    def release_template(self, path):
+        """Drop a reference taken with acquire()"""
+        with self.lock:
+            if path in self.refs:
+                self.refs[path] -= 1
+    
+    def evict_unused(self):
+        """Unload every model nothing holds a reference to"""
+        with self.lock:
+            unused = [path for path, count in self.refs.items() if count <= 0]
+            for path in unused:
+                self.loader.unloadModel(self.models.pop(path))
+                del self.refs[path]
+            return len(unused)
+    
+    def stats(self):
+        """Get (path, references) for every loaded model"""
+        with self.lock:
+            return sorted(self.refs.items())
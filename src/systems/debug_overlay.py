@@ -0,0 +1,61 @@
+from direct.showbase.DirectObject import DirectObject
+
+class DebugOverlay(DirectObject):
+    """Runtime toggles for the physics debug overlay and frame-rate meter"""
+    
+    # Hotkeys for individual debug channels
+    CHANNEL_KEYS = {
+        "f4": "wireframe",
+        "f5": "constraints",
+        "f6": "bounding_boxes",
+        "f7": "normals",
+    }
+    
+    def __init__(self, base, settings):
+        super().__init__()
+        self.base = base
+        self.settings = settings
+        
+        # Initial state comes from the "debug" settings section
+        self.enabled = settings.get_setting("debug", "physics_overlay")
+        self.channels = {
+            channel: settings.get_setting("debug", channel)
+            for channel in self.CHANNEL_KEYS.values()
+        }
+        self.base.setFrameRateMeter(settings.get_setting("debug", "frame_rate_meter"))
+        self.apply()
+        
+        # Bind hotkeys
+        self.accept("f3", self.toggle_overlay)
+        self.accept("f8", self.toggle_frame_rate_meter)
+        for key, channel in self.CHANNEL_KEYS.items():
+            self.accept(key, self.toggle_channel, [channel])
+    
+    def apply(self):
+        """Push the current toggles to the active collision system"""
+        collision_system = getattr(self.base, 'collision_system', None)
+        if not collision_system:
+            return
+        for channel, enabled in self.channels.items():
+            collision_system.set_debug_channel(channel, enabled)
+        collision_system.set_debug_enabled(self.enabled)
+    
+    def toggle_overlay(self):
+        """Toggle the Bullet debug overlay"""
+        self.enabled = not self.enabled
+        print(f"Physics debug overlay {'on' if self.enabled else 'off'}")
+        self.apply()
+    
+    def toggle_channel(self, channel):
+        """Toggle one debug channel"""
+        self.channels[channel] = not self.channels[channel]
+        print(f"Debug channel {channel} {'on' if self.channels[channel] else 'off'}")
+        self.apply()
+    
+    def toggle_frame_rate_meter(self):
+        """Toggle the frame-rate meter"""
+        self.base.setFrameRateMeter(not self.base.frameRateMeter)
+    
+    def cleanup(self):
+        """Unbind hotkeys"""
+        self.ignoreAll()
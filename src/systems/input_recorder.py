@@ -0,0 +1,122 @@
+import struct
+
+MAGIC = b"JREC"
+VERSION = 1
+HEADER = struct.Struct("<4sHIH")  # Magic, version, RNG seed, level number
+FRAME = struct.Struct("<dHff")  # dt, key/flag bits, mouse x, mouse y
+
+# Player.keys recorded per frame, one bit each in this order
+RECORDED_KEYS = ("forward", "backward", "left", "right", "jump", "run", "attack", "block", "dodge")
+
+# Extra state bits that change how the mouse is applied
+FLAG_HAS_MOUSE = 1 << 13  # Mouse was read this frame
+FLAG_MOUSE_ENABLED = 1 << 14
+FLAG_FIRING_MODE = 1 << 15
+
+class InputRecorder:
+    """Captures a Player's per-frame input into a compact binary stream
+    
+    Hook it up with player.input_recorder = recorder; Player.update then
+    calls capture() once per frame.
+    """
+    
+    def __init__(self, seed=0, level_number=0):
+        self.seed = seed
+        self.level_number = level_number
+        self.data = bytearray()
+        self.frame_count = 0
+    
+    def capture(self, player, dt, mouse):
+        """Append one frame of input (mouse is None when there was no mouse input)"""
+        bits = 0
+        for i, key in enumerate(RECORDED_KEYS):
+            if player.keys[key]:
+                bits |= 1 << i
+        if player.mouse_enabled:
+            bits |= FLAG_MOUSE_ENABLED
+        if player.is_in_firing_mode:
+            bits |= FLAG_FIRING_MODE
+        mouse_x, mouse_y = 0.0, 0.0
+        if mouse is not None:
+            bits |= FLAG_HAS_MOUSE
+            mouse_x, mouse_y = mouse
+        
+        self.data += FRAME.pack(dt, bits, mouse_x, mouse_y)
+        self.frame_count += 1
+    
+    def save(self, path):
+        """Write the header and every captured frame to a file"""
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, self.level_number))
+            f.write(self.data)
+        print(f"Saved {self.frame_count} input frames to {path}")
+
+class InputReplay:
+    """Feeds a recorded input stream back to a Player frame by frame
+    
+    Use it as a headless input script: apply() sets keys before each frame
+    and, with player.input_source = replay, get_mouse() replaces the mouse.
+    """
+    
+    def __init__(self, seed, level_number, frames):
+        self.seed = seed
+        self.level_number = level_number
+        self.frames = frames  # List of (dt, bits, mouse_x, mouse_y)
+        self.current = None
+        self.held = set()
+    
+    @classmethod
+    def load(cls, path):
+        """Read a recording written by InputRecorder.save"""
+        with open(path, "rb") as f:
+            data = f.read()
+        
+        magic, version, seed, level_number = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an input recording: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported input recording version {version}: {path}")
+        
+        frames = list(FRAME.iter_unpack(data[HEADER.size:]))
+        return cls(seed, level_number, frames)
+    
+    def __len__(self):
+        return len(self.frames)
+    
+    def dt_at(self, tick):
+        """Get the frame time recorded for a tick (None past the end)"""
+        if tick >= len(self.frames):
+            return None
+        return self.frames[tick][0]
+    
+    def apply(self, player, tick):
+        """Restore the key, mouse-mode and firing-mode state recorded for a tick"""
+        if tick >= len(self.frames):
+            self.current = None
+            self.release_all(player)
+            return
+        
+        self.current = self.frames[tick]
+        bits = self.current[1]
+        keys = {key for i, key in enumerate(RECORDED_KEYS) if bits & (1 << i)}
+        for key in self.held - keys:
+            player.updateKey(key, False)
+        for key in keys - self.held:
+            player.updateKey(key, True)
+        self.held = keys
+        
+        player.mouse_enabled = bool(bits & FLAG_MOUSE_ENABLED)
+        if bool(bits & FLAG_FIRING_MODE) != player.is_in_firing_mode:
+            player.toggle_firing_mode()
+    
+    def get_mouse(self, player):
+        """Get the recorded mouse offset for the current frame"""
+        if self.current is None or not self.current[1] & FLAG_HAS_MOUSE:
+            return None
+        return self.current[2], self.current[3]
+    
+    def release_all(self, player):
+        """Release every key the replay is holding"""
+        for key in self.held:
+            player.updateKey(key, False)
+        self.held = set()
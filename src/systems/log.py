@@ -0,0 +1,119 @@
+import atexit
+import logging
+import sys
+import threading
+from collections import deque
+
+ROOT_LOGGER = "jump"
+LOG_FORMAT = "%(relativeCreated)9.0fms %(levelname)-7s %(name)s: %(message)s"
+
+_exit_hook_registered = False
+
+def get_logger(subsystem):
+    """Get the logger for a subsystem (e.g. "enemy", "combat", "player", "hud")
+    
+    Log with %-style arguments so messages are only formatted when the
+    subsystem's level lets them through:
+        log.debug("Enemy in attack range (distance: %.1f)", distance)
+    """
+    return logging.getLogger(f"{ROOT_LOGGER}.{subsystem}")
+
+class RingBufferHandler(logging.Handler):
+    """Queues formatted records in a bounded ring buffer for a writer thread
+    
+    Messages are formatted when emitted (so later changes to the logged
+    objects don't leak into them) but written to the stream in batches by
+    a background thread. When the buffer is full the oldest lines are
+    dropped rather than blocking the game.
+    """
+    
+    def __init__(self, stream=None, capacity=4096, flush_interval=0.1):
+        super().__init__()
+        self.stream = stream or sys.stdout
+        self.buffer = deque(maxlen=capacity)
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.dropped_lock = threading.Lock()  # dropped is updated by both threads
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, name="log_writer", daemon=True)
+        self.thread.start()
+    
+    def emit(self, record):
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self.buffer) == self.buffer.maxlen:
+            with self.dropped_lock:
+                self.dropped += 1
+        self.buffer.append(line)
+    
+    def _run(self):
+        """Writer thread: drain the buffer every flush interval"""
+        while not self.stopping:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self._drain()
+        self._drain()
+    
+    def _drain(self):
+        """Write every buffered line in one go"""
+        lines = []
+        while self.buffer:
+            lines.append(self.buffer.popleft())
+        with self.dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            lines.append(f"(log buffer full, dropped {dropped} lines)")
+        if lines:
+            try:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+            except (OSError, ValueError):
+                pass
+    
+    def flush(self):
+        """Ask the writer thread to drain now"""
+        self.wake.set()
+    
+    def close(self):
+        """Stop the writer thread after it drains the buffer"""
+        self.stopping = True
+        self.wake.set()
+        if self.thread.is_alive() and threading.current_thread() is not self.thread:
+            self.thread.join(timeout=1.0)
+        super().close()
+
+def configure_logging(levels=None, default_level="WARNING", stream=None):
+    """Set up the async sink and per-subsystem levels
+    
+    levels maps subsystem names to level names, e.g. {"enemy": "DEBUG"}.
+    Calling again replaces the previous configuration.
+    """
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    
+    handler = RingBufferHandler(stream)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(default_level.upper())
+    root.propagate = False
+    
+    for subsystem, level in (levels or {}).items():
+        get_logger(subsystem).setLevel(level.upper())
+    
+    # One exit hook drains whichever handlers are installed at exit
+    global _exit_hook_registered
+    if not _exit_hook_registered:
+        atexit.register(_close_handlers)
+        _exit_hook_registered = True
+    return handler
+
+def _close_handlers():
+    """Flush and close the sink at interpreter exit"""
+    for handler in list(logging.getLogger(ROOT_LOGGER).handlers):
+        handler.close()
@@ -0,0 +1,260 @@
+import bisect
+import json
+import os
+import time
+from collections import deque
+
+from direct.gui.OnscreenText import OnscreenText
+from direct.showbase.DirectObject import DirectObject
+from direct.showbase.ShowBaseGlobal import globalClock
+from panda3d.core import AsyncTask, TextNode
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+BUCKET_BOUNDS_MS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 33.0)
+
+class RollingHistogram:
+    """Timing samples over the last N entries, with bucket counts kept in step"""
+    
+    def __init__(self, size=300):
+        self.samples = deque(maxlen=size)
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.total = 0.0
+    
+    def add(self, ms):
+        """Record one sample, evicting the oldest when full"""
+        if len(self.samples) == self.samples.maxlen:
+            old = self.samples[0]
+            self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, old)] -= 1
+            self.total -= old
+        self.samples.append(ms)
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.total += ms
+    
+    def __len__(self):
+        return len(self.samples)
+    
+    def mean(self):
+        """Get the mean sample in the window"""
+        return self.total / len(self.samples) if self.samples else 0.0
+    
+    def percentile(self, q):
+        """Get the q-th percentile (0..100) of the window"""
+        if not self.samples:
+            return 0.0
+        values = sorted(self.samples)
+        return values[min(len(values) - 1, int(len(values) * q / 100.0))]
+    
+    def max(self):
+        """Get the largest sample in the window"""
+        return max(self.samples) if self.samples else 0.0
+
+class TaskProfiler(DirectObject):
+    """Times every task added through taskMgr.add or doMethodLater, per task and per system
+    
+    Systems are named after the class owning the task's bound method
+    (e.g. CollisionSystem, Player). Tasks added before install() (or
+    as ready-made AsyncTasks) aren't timed; report() lists them as
+    untimed. F9 toggles the on-screen overlay and F10 starts/stops a
+    Chrome trace-event capture saved under profiles/.
+    """
+    MAX_TRACE_EVENTS = 200000
+    
+    def __init__(self, base, history=300, overlay_rows=8):
+        super().__init__()
+        self.base = base
+        self.history = history
+        self.overlay_rows = overlay_rows
+        
+        self.tasks = {}  # Task name -> RollingHistogram
+        self.systems = {}  # System name -> RollingHistogram of per-frame totals
+        self.frame_totals = {}  # System name -> ms spent this frame
+        self.frame = -1
+        self.wrapped = set()  # Names of tasks whose functions are timed
+        
+        self.capturing = False
+        self.trace_events = []
+        self.trace_origin = 0.0
+        
+        self.original_add = None
+        self.original_do_method_later = None
+        self.overlay = None
+        
+        # Bind hotkeys
+        self.accept("f9", self.toggle_overlay)
+        self.accept("f10", self.toggle_capture)
+    
+    def install(self):
+        """Start wrapping tasks added through taskMgr.add and taskMgr.doMethodLater"""
+        if self.original_add:
+            return
+        task_mgr = self.base.taskMgr
+        self.original_add = task_mgr.add
+        self.original_do_method_later = task_mgr.doMethodLater
+        
+        def add(funcOrTask, name=None, *args, **kwargs):
+            if callable(funcOrTask) and not isinstance(funcOrTask, AsyncTask):
+                funcOrTask = self.wrap(funcOrTask, name or getattr(funcOrTask, '__name__', 'task'))
+            return self.original_add(funcOrTask, name, *args, **kwargs)
+        
+        def do_method_later(delayTime, funcOrTask, name, *args, **kwargs):
+            if callable(funcOrTask) and not isinstance(funcOrTask, AsyncTask):
+                funcOrTask = self.wrap(funcOrTask, name)
+            return self.original_do_method_later(delayTime, funcOrTask, name, *args, **kwargs)
+        
+        task_mgr.add = add
+        task_mgr.doMethodLater = do_method_later
+    
+    def uninstall(self):
+        """Stop wrapping new tasks (already wrapped tasks keep reporting)"""
+        if self.original_add:
+            self.base.taskMgr.add = self.original_add
+            self.base.taskMgr.doMethodLater = self.original_do_method_later
+            self.original_add = None
+            self.original_do_method_later = None
+    
+    def wrap(self, func, name):
+        """Get a task function that records how long func takes"""
+        owner = getattr(func, '__self__', None)
+        system = type(owner).__name__ if owner is not None else "other"
+        record = self.record
+        perf_counter = time.perf_counter
+        self.wrapped.add(name)
+        
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, system, start, perf_counter())
+        
+        timed.__name__ = getattr(func, '__name__', name)
+        return timed
+    
+    def record(self, name, system, start, end):
+        """Add one task run to the histograms (and the trace when capturing)"""
+        ms = (end - start) * 1000.0
+        
+        # Fold the previous frame's per-system totals into their histograms
+        frame = globalClock.getFrameCount()
+        if frame != self.frame:
+            for system_name, total in self.frame_totals.items():
+                self._histogram(self.systems, system_name).add(total)
+            self.frame_totals.clear()
+            self.frame = frame
+        
+        self._histogram(self.tasks, name).add(ms)
+        self.frame_totals[system] = self.frame_totals.get(system, 0.0) + ms
+        
+        if self.capturing and len(self.trace_events) < self.MAX_TRACE_EVENTS:
+            self.trace_events.append({
+                "name": name,
+                "cat": system,
+                "ph": "X",
+                "ts": (start - self.trace_origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": 0,
+                "tid": 0,
+                "args": {"frame": frame},
+            })
+    
+    def _histogram(self, table, key):
+        """Get or create the histogram for a key"""
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = RollingHistogram(self.history)
+        return histogram
+    
+    def top_tasks(self, count=None):
+        """Get (name, histogram) pairs sorted by mean time, most expensive first"""
+        ranked = sorted(self.tasks.items(), key=lambda item: item[1].mean(), reverse=True)
+        return ranked[:count] if count else ranked
+    
+    def top_systems(self, count=None):
+        """Get (system, histogram) pairs sorted by mean per-frame time"""
+        ranked = sorted(self.systems.items(), key=lambda item: item[1].mean(), reverse=True)
+        return ranked[:count] if count else ranked
+    
+    def untimed_tasks(self):
+        """Get the sorted names of running tasks the profiler isn't timing"""
+        names = {task.getName() for task in self.base.taskMgr.getAllTasks()}
+        return sorted(names - self.wrapped)
+    
+    def report(self):
+        """Format the top consumers (and any untimed tasks) as text"""
+        lines = ["Task                      mean    p95    max (ms)"]
+        for name, histogram in self.top_tasks(self.overlay_rows):
+            lines.append(f"{name[:24]:<24} {histogram.mean():6.3f} {histogram.percentile(95):6.3f} {histogram.max():6.3f}")
+        lines.append("")
+        lines.append("System                    mean    p95  (ms/frame)")
+        for name, histogram in self.top_systems(self.overlay_rows):
+            lines.append(f"{name[:24]:<24} {histogram.mean():6.3f} {histogram.percentile(95):6.3f}")
+        untimed = self.untimed_tasks()
+        if untimed:
+            lines.append("")
+            lines.append(f"Untimed: {', '.join(untimed)}")
+        if self.capturing:
+            lines.append("")
+            lines.append(f"Capturing trace: {len(self.trace_events)} events")
+        return "\n".join(lines)
+    
+    def toggle_overlay(self):
+        """Show or hide the top-consumers overlay"""
+        if self.overlay:
+            self.base.taskMgr.remove("profiler_overlay")
+            self.overlay.destroy()
+            self.overlay = None
+            return
+        
+        self.overlay = OnscreenText(
+            text="",
+            pos=(-1.3, 0.8),
+            scale=0.04,
+            fg=(1, 1, 0.6, 1),
+            bg=(0, 0, 0, 0.6),
+            align=TextNode.ALeft,
+            font=self.base.loader.loadFont("cmtt12"),  # Monospace keeps columns aligned
+            mayChange=True
+        )
+        self.base.taskMgr.doMethodLater(0.5, self.update_overlay, "profiler_overlay")
+    
+    def update_overlay(self, task):
+        """Refresh the overlay text twice a second"""
+        if self.overlay:
+            self.overlay.setText(self.report())
+        return task.again
+    
+    def start_capture(self):
+        """Start recording trace events"""
+        self.trace_events = []
+        self.trace_origin = time.perf_counter()
+        self.capturing = True
+    
+    def stop_capture(self, path=None):
+        """Stop recording and export the trace, returning the file path"""
+        self.capturing = False
+        if path is None:
+            os.makedirs("profiles", exist_ok=True)
+            path = os.path.join("profiles", f"trace_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        self.export_trace(path)
+        return path
+    
+    def toggle_capture(self):
+        """Start a capture, or stop the running one and save it"""
+        if self.capturing:
+            path = self.stop_capture()
+            print(f"Saved {len(self.trace_events)} trace events to {path}")
+        else:
+            self.start_capture()
+            print("Started trace capture")
+    
+    def export_trace(self, path):
+        """Write captured events as Chrome trace-event JSON (chrome://tracing, Perfetto)"""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.trace_events, "displayTimeUnit": "ms"}, f)
+    
+    def cleanup(self):
+        """Restore taskMgr.add/doMethodLater and remove the overlay"""
+        self.uninstall()
+        if self.overlay:
+            self.toggle_overlay()
+        self.ignoreAll()
@@ -0,0 +1,79 @@
+import json
+
+# Simple route used when no script is given. The shipped levels put the spawn on the
+# corner of a ground slab (at least 10x10) that extends along +X and +Y, so the
+# route steps into the slab, makes short out-and-back moves and hops in place
+# around (7.5, 2.5), clear of the low platforms, then walks back to the spawn.
+# Every loop ends where it started, so the player stays on the slab.
+DEFAULT_SCRIPT = [
+    {"ticks": 30, "keys": []},
+    {"ticks": 14, "keys": ["forward", "right"]},
+    {"ticks": 20, "keys": ["right"]},
+    {"ticks": 8, "keys": ["forward"]},
+    {"ticks": 8, "keys": ["backward"]},
+    {"ticks": 5, "keys": ["jump"]},
+    {"ticks": 70, "keys": []},
+    {"ticks": 8, "keys": ["left"]},
+    {"ticks": 8, "keys": ["right"]},
+    {"ticks": 8, "keys": ["right"]},
+    {"ticks": 8, "keys": ["left"]},
+    {"ticks": 8, "keys": ["backward"]},
+    {"ticks": 8, "keys": ["forward"]},
+    {"ticks": 5, "keys": ["forward", "run"]},
+    {"ticks": 5, "keys": ["backward", "run"]},
+    {"ticks": 5, "keys": ["jump"]},
+    {"ticks": 70, "keys": []},
+    {"ticks": 20, "keys": ["left"]},
+    {"ticks": 14, "keys": ["backward", "left"]},
+]
+
+class ScriptedInput:
+    """Drives a Player's keys from a list of timed steps instead of the keyboard
+    
+    Each step is {"ticks": n, "keys": [...]} and holds the listed Player.keys
+    names down for n ticks. The script loops when it runs out.
+    """
+    
+    def __init__(self, steps=None, loop=True):
+        self.steps = steps if steps is not None else DEFAULT_SCRIPT
+        self.loop = loop
+        self.length = sum(step["ticks"] for step in self.steps)
+        self.held = set()
+    
+    @classmethod
+    def from_file(cls, path, loop=True):
+        """Load a script from a JSON file ({"steps": [...]} or a bare list)"""
+        with open(path, "r") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return cls(data["steps"], loop=data.get("loop", loop))
+        return cls(data, loop=loop)
+    
+    def keys_at(self, tick):
+        """Get the set of keys held at a tick"""
+        if self.length <= 0:
+            return set()
+        if self.loop:
+            tick %= self.length
+        elif tick >= self.length:
+            return set()
+        for step in self.steps:
+            if tick < step["ticks"]:
+                return set(step["keys"])
+            tick -= step["ticks"]
+        return set()
+    
+    def apply(self, player, tick):
+        """Press and release player keys to match the script at a tick"""
+        keys = self.keys_at(tick)
+        for key in self.held - keys:
+            player.updateKey(key, False)
+        for key in keys - self.held:
+            player.updateKey(key, True)
+        self.held = keys
+    
+    def release_all(self, player):
+        """Release every key the script is holding"""
+        for key in self.held:
+            player.updateKey(key, False)
+        self.held = set()
@@ -10,13 +10,39 @@ class Settings:
                 "resolution": (1280, 720),
                 "fullscreen": False,
                 "vsync": True,
-                "graphics_quality": "medium"  # low, medium, high
+                "graphics_quality": "medium",  # low, medium, high
+                "tracer_renderer": "pooled"  # pooled or instanced (opt-in)
             },
             "audio": {
                 "master_volume": 1.0,
                 "music_volume": 0.7,
                 "sfx_volume": 0.8
             },
+            "physics": {
+                "tick_rate": 60,  # Fixed physics ticks per second
+                "max_catchup_steps": 5  # Ticks allowed per frame after a hitch
+            },
+            "loading": {
+                "build_budget_ms": 4.0  # Main-thread level construction per frame
+            },
+            "debug": {
+                "physics_overlay": False,  # Bullet debug overlay (F3)
+                "frame_rate_meter": False,  # F8
+                "wireframe": True,  # F4
+                "constraints": False,  # F5
+                "bounding_boxes": False,  # F6
+                "normals": False,  # F7
+                "record_input": False,  # Save each run's input to recordings/
+                "task_profiler": False  # Time every task (F9 overlay, F10 trace capture)
+            },
+            "logging": {
+                "default": "WARNING",  # Level for subsystems not listed below
+                "enemy": "WARNING",
+                "combat": "WARNING",
+                "player": "WARNING",
+                "hud": "WARNING",
+                "level": "WARNING"
+            },
             "controls": {
                 "move_forward": ["w", "arrow_up"],
                 "move_backward": ["s", "arrow_down"],
@@ -103,6 +129,10 @@ class Settings:
         """Get graphics quality setting"""
         return self.get_setting("video", "graphics_quality")
     
+    def get_tracer_renderer(self):
+        """Get bullet tracer rendering backend"""
+        return self.get_setting("video", "tracer_renderer")
+    
     def get_master_volume(self):
         """Get master volume setting"""
         return self.get_setting("audio", "master_volume")
@@ -115,6 +145,24 @@ class Settings:
         """Get sound effects volume setting"""
         return self.get_setting("audio", "sfx_volume")
     
+    def get_log_levels(self):
+        """Get per-subsystem log levels (the "default" entry applies to the rest)"""
+        levels = dict(self.default_settings["logging"])
+        levels.update(self.settings.get("logging", {}))
+        return levels
+    
+    def get_physics_tick_rate(self):
+        """Get fixed physics tick rate"""
+        return self.get_setting("physics", "tick_rate")
+    
+    def get_max_catchup_steps(self):
+        """Get maximum physics ticks per frame"""
+        return self.get_setting("physics", "max_catchup_steps")
+    
+    def get_build_budget_ms(self):
+        """Get milliseconds per frame spent building a level"""
+        return self.get_setting("loading", "build_budget_ms")
+    
     def get_key_bindings(self):
         """Get all key bindings"""
         return self.get_setting("controls", {}) 
\ No newline at end of file
@@ -0,0 +1,63 @@
+import time
+
+class TimeSlicedJob:
+    """Runs a generator a few steps per frame within a time budget
+    
+    The generator does one small unit of work per step and yields the
+    fraction of the whole job done so far (0..1). Each frame the job
+    steps it until budget_ms has been spent, so no frame stalls however
+    big the job is. done_callback() runs once the generator is exhausted.
+    """
+    
+    def __init__(self, base, steps, name, budget_ms=4.0, done_callback=None):
+        self.base = base
+        self.steps = steps
+        self.name = name
+        self.budget = budget_ms / 1000.0
+        self.done_callback = done_callback
+        self.progress = 0.0
+        self.frames = 0
+        self.is_done = False
+    
+    def start(self):
+        """Start stepping from the task manager"""
+        self.base.taskMgr.add(self.update, self.name)
+        return self
+    
+    def run_slice(self):
+        """Step until the budget is spent, returning True once the job is finished"""
+        deadline = time.perf_counter() + self.budget
+        for progress in self.steps:
+            self.progress = progress
+            if time.perf_counter() >= deadline:
+                return False
+        self.progress = 1.0
+        return True
+    
+    def update(self, task):
+        """Run one frame's slice"""
+        self.frames += 1
+        if not self.run_slice():
+            return task.cont
+        self._finish()
+        return task.done
+    
+    def finish(self):
+        """Run the rest of the job now, in this frame"""
+        self.base.taskMgr.remove(self.name)
+        for progress in self.steps:
+            self.progress = progress
+        self.progress = 1.0
+        self._finish()
+    
+    def _finish(self):
+        if self.is_done:
+            return
+        self.is_done = True
+        if self.done_callback:
+            self.done_callback()
+    
+    def cancel(self):
+        """Stop stepping, leaving the job part done"""
+        self.base.taskMgr.remove(self.name)
+        self.steps.close()
@@ -77,7 +77,7 @@ class GameOverScreen:
     
     def on_retry(self):
         """Handle retry button click"""
-        self.game_manager.request('Playing')
+        self.game_manager.restart_level()
     
     def on_menu(self):
         """Handle menu button click"""
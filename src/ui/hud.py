@@ -1,19 +1,40 @@
 from direct.gui.DirectGui import DirectWaitBar, DirectLabel, DirectFrame
+from direct.showbase.DirectObject import DirectObject
 from direct.gui.OnscreenText import OnscreenText
 from direct.task.TaskManagerGlobal import taskMgr
 from direct.task.Task import Task
 from direct.showbase.ShowBaseGlobal import globalClock
 from panda3d.core import TextNode
+from systems.log import get_logger
+from game.player_stats import PlayerStats
 
-class HUD:
+log = get_logger("hud")
+
+# Health fraction thresholds for the bar colour bands
+HEALTH_COLORS = (
+    (0.6, (0.2, 0.8, 0.2, 1)),  # Green
+    (0.3, (0.8, 0.8, 0.2, 1)),  # Yellow
+    (-1.0, (0.8, 0.2, 0.2, 1)),  # Red
+)
+
+class HUD(DirectObject):
     def __init__(self, base):
+        super().__init__()
         self.base = base
         
         # Initialize stopwatch variables
         self.stopwatch_running = False
+        self.stopwatch_paused = False
         self.start_time = 0
         self.elapsed_time = 0
         
+        # Last values pushed to each widget, so unchanged ones are skipped
+        self.shown_health = 100
+        self.shown_health_text = "100/100"
+        self.shown_bar_color = HEALTH_COLORS[0][1]
+        self.shown_lives = 3
+        self.shown_hundredths = 0
+        
         # Create health bar in top left
         self.health_bar = DirectWaitBar(
             text="",  # We'll use a separate label for the text
@@ -87,41 +108,78 @@ class HUD:
             )
             self.tooltips.append(tooltip)
         
+        # Follow player stats through change events instead of polling
+        self.accept(PlayerStats.EVENT, self.on_stats_changed)
+        if hasattr(self.base, 'player') and self.base.player:
+            stats = self.base.player.stats
+            self.update_health(stats.health, stats.max_health)
+            self.update_lives(stats.lives)
+        
         # Add update task for stopwatch
         taskMgr.add(self.update_stopwatch, "stopwatch_task")
     
+    def on_stats_changed(self, stats, changes):
+        """Refresh the widgets affected by this frame's stat changes"""
+        if 'health' in changes or 'max_health' in changes:
+            self.update_health(stats.health, stats.max_health)
+        if 'lives' in changes:
+            self.update_lives(stats.lives)
+    
     def update_health(self, current_health, max_health):
-        """Update health bar and text"""
-        self.health_bar['value'] = current_health
-        self.health_text.setText(f"{int(current_health)}/{max_health}")
+        """Update health bar and text, touching only what changed"""
+        if current_health != self.shown_health:
+            self.shown_health = current_health
+            self.health_bar['value'] = current_health
+        
+        text = f"{int(current_health)}/{max_health}"
+        if text != self.shown_health_text:
+            self.shown_health_text = text
+            self.health_text.setText(text)
         
         # Update color based on health percentage
         health_percent = current_health / max_health
-        if health_percent > 0.6:
-            self.health_bar['barColor'] = (0.2, 0.8, 0.2, 1)  # Green
-        elif health_percent > 0.3:
-            self.health_bar['barColor'] = (0.8, 0.8, 0.2, 1)  # Yellow
-        else:
-            self.health_bar['barColor'] = (0.8, 0.2, 0.2, 1)  # Red
+        color = next(color for threshold, color in HEALTH_COLORS if health_percent > threshold)
+        if color != self.shown_bar_color:
+            self.shown_bar_color = color
+            self.health_bar['barColor'] = color
     
     def update_lives(self, lives):
-        """Update lives counter"""
-        self.lives_text.setText(f"Lives: {lives}")
+        """Update lives counter if it changed"""
+        if lives != self.shown_lives:
+            self.shown_lives = lives
+            self.lives_text.setText(f"Lives: {lives}")
     
     def start_stopwatch(self):
         """Start the stopwatch"""
-        print("Starting stopwatch")  # Debug print
+        log.info("Starting stopwatch")
         self.stopwatch_running = True
+        self.stopwatch_paused = False
         self.start_time = globalClock.getRealTime()
         self.elapsed_time = 0
+        self.shown_hundredths = -1  # Force a redraw on the next update
     
     def stop_stopwatch(self):
         """Stop the stopwatch"""
+        self.stopwatch_paused = False
         if self.stopwatch_running:
-            print("Stopping stopwatch")  # Debug print
+            log.info("Stopping stopwatch")
             self.stopwatch_running = False
             self.elapsed_time = globalClock.getRealTime() - self.start_time
-            print(f"Final time: {self.elapsed_time:.2f} seconds")  # Debug print
+            log.info("Final time: %.2f seconds", self.elapsed_time)
+    
+    def pause_stopwatch(self):
+        """Freeze the stopwatch so paused time isn't counted"""
+        if self.stopwatch_running:
+            self.elapsed_time = globalClock.getRealTime() - self.start_time
+            self.stopwatch_running = False
+            self.stopwatch_paused = True
+    
+    def resume_stopwatch(self):
+        """Carry on timing from where pause_stopwatch froze it"""
+        if self.stopwatch_paused:
+            self.start_time = globalClock.getRealTime() - self.elapsed_time
+            self.stopwatch_running = True
+            self.stopwatch_paused = False
     
     def get_elapsed_time(self):
         """Get the elapsed time in seconds"""
@@ -130,13 +188,15 @@ class HUD:
         return self.elapsed_time
     
     def update_stopwatch(self, task):
-        """Update stopwatch display"""
+        """Update stopwatch display when the shown hundredths change"""
         if self.stopwatch_running:
-            elapsed = self.get_elapsed_time()
-            minutes = int(elapsed // 60)
-            seconds = elapsed % 60
-            self.stopwatch_text.setText(f"Time: {minutes}:{seconds:05.2f}")
-            print(f"Stopwatch update: {minutes}:{seconds:05.2f}")  # Debug print
+            hundredths = int(self.get_elapsed_time() * 100)
+            if hundredths != self.shown_hundredths:
+                self.shown_hundredths = hundredths
+                minutes, centiseconds = divmod(hundredths, 6000)
+                seconds = centiseconds / 100.0
+                self.stopwatch_text.setText(f"Time: {minutes}:{seconds:05.2f}")
+                log.debug("Stopwatch update: %d:%05.2f", minutes, seconds)
         return Task.cont
     
     def cleanup(self):
@@ -149,3 +209,4 @@ class HUD:
         for tooltip in self.tooltips:
             tooltip.destroy()
         taskMgr.remove("stopwatch_task")
+        self.ignoreAll()
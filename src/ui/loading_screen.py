@@ -0,0 +1,69 @@
+from direct.gui.DirectGui import (
+    DirectFrame,
+    DirectLabel,
+    DirectWaitBar
+)
+from direct.task import Task
+from panda3d.core import TextNode
+
+class LoadingScreen:
+    def __init__(self, game_manager, loader, title="Loading..."):
+        self.game_manager = game_manager
+        self.base = game_manager.base
+        self.loader = loader  # Anything with progress (0..1) and stage
+        
+        # Opaque background hides the scene while it is assembled
+        self.background = DirectFrame(
+            frameColor=(0, 0, 0, 1),
+            frameSize=(-2, 2, -2, 2),
+            pos=(0, 0, 0)
+        )
+        
+        # Title
+        self.title = DirectLabel(
+            text=title,
+            text_scale=0.1,
+            text_fg=(1, 1, 1, 1),
+            text_align=TextNode.ACenter,
+            frameColor=(0, 0, 0, 0),
+            pos=(0, 0, 0.15),
+            parent=self.background
+        )
+        
+        # Progress bar
+        self.progress_bar = DirectWaitBar(
+            range=100,
+            value=0,
+            pos=(0, 0, -0.05),
+            scale=(0.6, 1, 0.4),
+            barColor=(0.2, 0.7, 0.2, 1),
+            frameColor=(0.2, 0.2, 0.2, 0.8),
+            parent=self.background
+        )
+        
+        # Current loading stage
+        self.stage_label = DirectLabel(
+            text="",
+            text_scale=0.05,
+            text_fg=(0.8, 0.8, 0.8, 1),
+            text_align=TextNode.ACenter,
+            frameColor=(0, 0, 0, 0),
+            pos=(0, 0, -0.2),
+            parent=self.background
+        )
+        self.shown_stage = None
+        
+        self.base.taskMgr.add(self.update, "loading_screen_update")
+    
+    def update(self, task):
+        """Mirror the loader's progress every frame"""
+        self.progress_bar['value'] = self.loader.progress * 100
+        if self.loader.stage != self.shown_stage:
+            self.shown_stage = self.loader.stage
+            self.stage_label['text'] = self.shown_stage
+        return Task.cont
+    
+    def cleanup(self):
+        """Clean up resources"""
+        self.base.taskMgr.remove("loading_screen_update")
+        self.background.destroy()
@@ -115,12 +115,12 @@ class PauseMenu:
     def on_resume(self):
         """Handle resume button click"""
         self.hide()
-        self.game_manager.request('Playing')
+        self.game_manager.resume_game()
     
     def on_restart(self):
         """Handle restart button click"""
         self.hide()
-        self.game_manager.request('Playing')  # Will restart the current level
+        self.game_manager.restart_level()
     
     def on_options(self):
         """Handle options button click"""